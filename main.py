@@ -1,43 +1,428 @@
 from mcp.server.fastmcp import FastMCP
 import win32com.client
+from win32com.client import gencache
+import pywintypes
+import pythoncom
 import os
-import uuid
+import base64
+import tempfile
+import asyncio
+import atexit
+import functools
+import gc
+import inspect
+import itertools
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from concurrent.futures import Future
 from typing import Dict, List, Optional, Any
 
 mcp = FastMCP("ppts")
 
 USER_AGENT = "ppts-app/1.0"
 
+# PowerPoint / Office enumeration values used in comparisons and arguments
+MSO_TRUE = -1                       # MsoTriState.msoTrue
+MSO_FALSE = 0                       # MsoTriState.msoFalse
+MSO_GROUP = 6                       # MsoShapeType.msoGroup
+MSO_TEXT_BOX = 17                   # MsoShapeType.msoTextBox
+MSO_TEXT_ORIENTATION_HORIZONTAL = 1 # MsoTextOrientation.msoTextOrientationHorizontal
+PP_SELECTION_SHAPES = 2             # PpSelectionType.ppSelectionShapes
+PP_SELECTION_TEXT = 3               # PpSelectionType.ppSelectionText
+
+# Shape types that can carry a text frame (autoshape, callout, freeform, group,
+# placeholder, text box); pictures, charts, tables etc. are never probed for text
+TEXT_SHAPE_TYPES = frozenset({1, 2, 5, 6, 14, 17})
+
+# Microsoft Office type library (CLSID, LCID, major, minor); defines TextFrame2, Font2 etc.
+OFFICE_TYPELIB = ("{2DF8D04C-5BFA-101B-BDE5-00AA0044DE52}", 0, 2, 4)
+
+# Raised when a COM object doesn't support a member (e.g. TextFrame on a picture)
+COM_ERRORS = (pywintypes.com_error, AttributeError)
+# Raised when a slide / shape ID is rejected by Slides.Item / Shapes.Item (or is below 1)
+ID_LOOKUP_ERRORS = COM_ERRORS + (IndexError,)
+
+# Upper bound on entries per PPTAutomation cache (oldest entries are evicted first)
+PROXY_CACHE_SIZE = 256
+
+# Slide.Export filter name (must be uppercase) and file extension per accepted image_format
+EXPORT_FORMATS = {"PNG": ("PNG", "png"), "JPG": ("JPG", "jpg"), "JPEG": ("JPG", "jpg")}
+
+# Export filenames: server start time and process ID plus a running number, so servers
+# started in the same second (e.g. sharing TMPDIR_RAM) never reuse each other's names
+EXPORT_RUN_TAG = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+export_counter = itertools.count(1)
+
+# Shape copy / geometry tools run a full garbage collection every this many calls
+COM_GC_INTERVAL = 32
+
+# VBA helpers installed into a hidden, windowless helper presentation (never into the
+# user's files). Each one does inside PowerPoint what would otherwise take several COM
+# round-trips, and returns its result as a single string, so the whole operation costs
+# one Application.Run. Records are separated by Chr(30), fields by Chr(31).
+HELPER_MACROS = """
+Function DumpShapes(sld As Object) As String
+    Dim out As String, shp As Object, txt As String, hasTxt As Long
+    For Each shp In sld.Shapes
+        txt = ""
+        hasTxt = 0
+        ' A failing statement is skipped, leaving the defaults for shapes without text
+        On Error Resume Next
+        hasTxt = -(shp.HasTextFrame And shp.TextFrame.HasText)
+        If hasTxt = 1 Then txt = shp.TextFrame.TextRange.Text
+        On Error GoTo 0
+        out = out & shp.Name & Chr(31) & shp.Type & Chr(31) & hasTxt & Chr(31) & txt & Chr(30)
+    Next
+    DumpShapes = out
+End Function
+
+Function SetPos(shp As Object, L As Double, T As Double, W As Double, H As Double, m As Long) As String
+    ' m is a bit mask of the values to apply: 1 = Left, 2 = Top, 4 = Width, 8 = Height
+    With shp
+        If m And 1 Then .Left = L
+        If m And 2 Then .Top = T
+        If m And 4 Then .Width = W
+        If m And 8 Then .Height = H
+        ' Str() always uses "." as the decimal separator
+        SetPos = Str(.Left) & Chr(31) & Str(.Top) & Chr(31) & Str(.Width) & Chr(31) & Str(.Height)
+    End With
+End Function
+
+Function SlideSignature(sld As Object) As String
+    Dim out As String, shp As Object, txt As String
+    out = sld.SlideID & Chr(30)
+    For Each shp In sld.Shapes
+        txt = ""
+        On Error Resume Next
+        txt = shp.TextFrame.TextRange.Text
+        On Error GoTo 0
+        out = out & shp.Id & Chr(31) & Str(shp.Left) & Chr(31) & Str(shp.Top) & Chr(31) & Str(shp.Width) & Chr(31) & Str(shp.Height) & Chr(31) & txt & Chr(30)
+    Next
+    SlideSignature = out
+End Function
+
+Function DumpSections(pres As Object) As String
+    Dim out As String, sp As Object, i As Long
+    Set sp = pres.SectionProperties
+    For i = 1 To sp.Count
+        out = out & sp.Name(i) & Chr(31) & sp.SectionID(i) & Chr(31) & sp.FirstSlide(i) & Chr(31) & sp.SlidesCount(i) & Chr(30)
+    Next
+    DumpSections = out
+End Function
+"""
+MACRO_RECORD_SEP = "\x1e"
+MACRO_FIELD_SEP = "\x1f"
+VBEXT_CT_STD_MODULE = 1             # vbext_ComponentType.vbext_ct_StdModule
+
+def early_bind(obj):
+    """
+    Wrap a PowerPoint COM object (or ProgID) in a makepy-generated early-bound proxy.
+
+    Early-bound proxies carry the DISPIDs from the PowerPoint type library, so each
+    property read is a single Invoke instead of a GetIDsOfNames + Invoke pair. Objects
+    reached from an early-bound Application (presentations, slides, shapes) are typed
+    as well. Falls back to late binding if the makepy cache cannot be generated
+    (e.g. a read-only gen_py directory).
+    """
+    try:
+        return gencache.EnsureDispatch(obj)
+    except Exception:
+        return win32com.client.Dispatch(obj)
+
+# Quote characters removed from slide / shape ID arguments by parse_id()
+ID_QUOTE_TABLE = str.maketrans("", "", "\"'`")
+
+def parse_id(value):
+    """
+    Convert a slide / shape ID argument to an int.
+
+    Clients frequently send IDs as quoted strings (e.g. '"3"' or "`3`"), so quotes
+    and backticks are removed first; ints are returned as-is. Raises ValueError if
+    the remainder is not an integer.
+    """
+    if type(value) is int:
+        return value
+    return int(str(value).translate(ID_QUOTE_TABLE))
+
+# Calls counted by collect_com_garbage()
+com_gc_calls = itertools.count(1)
+
+def collect_com_garbage():
+    """
+    Run gc.collect() on every COM_GC_INTERVAL-th call.
+
+    PowerPoint keeps a shape alive while any proxy to it exists, and proxies caught
+    in reference cycles (e.g. via exception tracebacks) are only released by the
+    cycle collector. Long sessions of copying and moving shapes otherwise leave
+    PowerPoint holding stale shape interfaces.
+    """
+    if next(com_gc_calls) % COM_GC_INTERVAL == 0:
+        gc.collect()
+
 class PPTAutomation:
     def __init__(self):
         self.ppt_app = None
         self.presentations = {}  # Store presentation IDs and their objects
+        self._ids_by_object = {}  # Reverse index: presentation IUnknown -> ID
+        self._id_counter = itertools.count(1)  # Source of presentation IDs
+        self._undo_depth = 0  # Nesting depth of undo_entry() blocks
+        # How ppt_app was obtained: "active" (GetActiveObject), "dispatch" (new instance) or None
+        self._init_mode = None
+        # Hidden presentation holding HELPER_MACROS; _macros_available is None until tried
+        self._macro_host = None
+        self._macro_host_name = None
+        self._macros_available = None
+        # list_all_shapes_in_slide() results: (presentation_id, slide_idx) -> (pres, stamp, result)
+        self._shape_list_cache = {}
+        # Text API that worked for a shape: (presentation_id, slide_idx, shape_idx) -> TEXT_APIS entry
+        self._text_api_cache = {}
+        # Slide exports: (presentation_id, slide_idx, filter_name, width, height) -> (pres, fingerprint, path)
+        self._export_cache = {}
         
-    def initialize(self):
+    def initialize(self, visible=True, reconnect=True):
+        """
+        Connect to a running PowerPoint instance, or start one.
+
+        GetActiveObject can be very slow when no instance is registered, so once it
+        has failed, implicit (reconnect=False) attempts go straight to starting a new
+        instance. An explicit initialize_powerpoint() call always retries it.
+        """
+        app = None
+        if reconnect or self._init_mode != "dispatch":
+            try:
+                # Try to connect to a running PowerPoint instance
+                app = win32com.client.GetActiveObject("PowerPoint.Application")
+            except pywintypes.com_error:
+                app = None
+        self._init_mode = "active" if app is not None else "dispatch"
+        # Don't leave the previous hidden macro host open in the PowerPoint instance
+        self.close_macro_host()
+
         try:
-            # Try to connect to a running PowerPoint instance
-            self.ppt_app = win32com.client.GetActiveObject("PowerPoint.Application")
+            if app is not None:
+                self.ppt_app = early_bind(app)
+            else:
+                # If no instance is running, create a new one
+                self.ppt_app = early_bind("PowerPoint.Application")
+                if visible:
+                    self.ppt_app.Visible = True
+            # TextFrame2 and its TextRange / Font come from the Office type library, so
+            # generate that too; otherwise those objects fall back to late binding
+            try:
+                gencache.EnsureModule(*OFFICE_TYPELIB)
+            except Exception:
+                pass
             return True
-        except:
+        except pywintypes.com_error:
+            return False
+
+    def ensure_app(self):
+        """Connect to PowerPoint on first use; later calls reuse the cached connection"""
+        if self.ppt_app is None:
+            self.initialize(reconnect=False)
+        return self.ppt_app
+
+    @contextmanager
+    def undo_entry(self):
+        """
+        Group the edits made inside the block into a single PowerPoint undo step.
+
+        Only the outermost of nested blocks starts a new undo entry. Builds that don't
+        expose Application.StartNewUndoEntry run the block unchanged.
+        """
+        if self.ppt_app is not None and self._undo_depth == 0:
             try:
-                # If no instance is running, create a new one
-                self.ppt_app = win32com.client.Dispatch("PowerPoint.Application")
-                self.ppt_app.Visible = True
-                return True
-            except:
-                return False
-                
+                self.ppt_app.StartNewUndoEntry()
+            except COM_ERRORS:
+                pass
+        self._undo_depth += 1
+        try:
+            yield
+        finally:
+            self._undo_depth -= 1
+
+    def register(self, pres):
+        """
+        Store a presentation under a new ID and return the ID.
+
+        A presentation that is already registered keeps its ID. It is looked up by
+        its pres._oleobj_ first; a different wrapper of the same presentation misses
+        there and is found by comparing it with the registered presentations.
+        """
+        key = self._identity(pres)
+        pres_id = self._ids_by_object.get(key) if key is not None else None
+        if pres_id is not None and pres_id in self.presentations:
+            return pres_id
+        for pres_id, existing in self.presentations.items():
+            try:
+                if existing == pres:
+                    return pres_id
+            except COM_ERRORS:
+                continue
+        pres_id = str(next(self._id_counter))
+        self.presentations[pres_id] = pres
+        if key is not None:
+            self._ids_by_object[key] = pres_id
+        return pres_id
+
+    def unregister(self, presentation_id):
+        """Forget a presentation (e.g. after closing it) and everything cached for it"""
+        self.invalidate(presentation_id)
+        pres = self.presentations.pop(presentation_id, None)
+        key = self._identity(pres)
+        if key is not None and self._ids_by_object.get(key) == presentation_id:
+            del self._ids_by_object[key]
+
+    @staticmethod
+    def _identity(pres):
+        """Return a hashable identity for a presentation proxy, or None"""
+        try:
+            key = pres._oleobj_
+            hash(key)
+            return key
+        except (AttributeError, TypeError):
+            return None
+
+    def get_slide(self, presentation_id, slide_idx):
+        """Return the Slide at slide_idx (1-based) of a registered presentation"""
+        return self.presentations[presentation_id].Slides.Item(slide_idx)
+
+    def get_shape(self, presentation_id, slide_idx, shape_idx):
+        """Return the Shape at shape_idx (1-based) on a slide of a registered presentation"""
+        return self.get_slide(presentation_id, slide_idx).Shapes.Item(shape_idx)
+
+    def invalidate(self, presentation_id):
+        """Drop cached data of a presentation after a structural change (slides or shapes added, removed or moved)"""
+        for cache in (self._shape_list_cache, self._text_api_cache, self._export_cache):
+            for key in [key for key in cache if key[0] == presentation_id]:
+                del cache[key]
+
+    def get_shape_list(self, presentation_id, slide_idx, stamp):
+        """
+        Return the cached list_all_shapes_in_slide() result for a slide, or None.
+
+        stamp is the slide's current (SlideID, Shapes.Count); a listing taken under a
+        different stamp is stale (slide moved, shapes added or deleted in the UI).
+        """
+        entry = self._shape_list_cache.get((presentation_id, slide_idx))
+        if (entry is not None and entry[0] is self.presentations.get(presentation_id)
+                and entry[1] == stamp):
+            return entry[2]
+        return None
+
+    def cache_shape_list(self, presentation_id, slide_idx, stamp, result):
+        """Remember a list_all_shapes_in_slide() result taken under stamp"""
+        self._cache_proxy(
+            self._shape_list_cache, (presentation_id, slide_idx),
+            (self.presentations[presentation_id], stamp, result)
+        )
+
+    def text_api(self, presentation_id, slide_idx, shape_idx):
+        """Return the text API that last worked for a shape (see apply_shape_font), or None"""
+        return self._text_api_cache.get((presentation_id, slide_idx, shape_idx))
+
+    def remember_text_api(self, presentation_id, slide_idx, shape_idx, api):
+        self._cache_proxy(self._text_api_cache, (presentation_id, slide_idx, shape_idx), api)
+
+    def cached_export(self, presentation_id, slide_idx, filter_name, width, height, fingerprint):
+        """
+        Return the path of an earlier export that is still on disk, or None.
+
+        The export is only reused if the slide's current slide_fingerprint() matches
+        the one taken when it was exported.
+        """
+        entry = self._export_cache.get((presentation_id, slide_idx, filter_name, width, height))
+        if (entry is not None and entry[0] is self.presentations.get(presentation_id)
+                and entry[1] == fingerprint and os.path.exists(entry[2])):
+            return entry[2]
+        return None
+
+    def remember_export(self, presentation_id, slide_idx, filter_name, width, height, fingerprint, path):
+        self._cache_proxy(
+            self._export_cache, (presentation_id, slide_idx, filter_name, width, height),
+            (self.presentations[presentation_id], fingerprint, path)
+        )
+
+    def forget_export_path(self, path):
+        """Drop every cached export that points at path (e.g. before the file is replaced or deleted)"""
+        for key in [key for key, entry in self._export_cache.items() if entry[2] == path]:
+            del self._export_cache[key]
+
+    def forget_slide_content(self, presentation_id, slide_idx):
+        """Drop a slide's cached shape listing and exports after a tool changed its shapes' text, fonts or geometry"""
+        self._shape_list_cache.pop((presentation_id, slide_idx), None)
+        for key in [key for key in self._export_cache if key[:2] == (presentation_id, slide_idx)]:
+            del self._export_cache[key]
+
+    @staticmethod
+    def _cache_proxy(cache, key, value):
+        if len(cache) >= PROXY_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = value
+
+    def run_macro(self, name, *args):
+        """
+        Run one of the HELPER_MACROS functions and return its result.
+
+        The macros are installed on first use. Returns None if they are unavailable
+        (typically because "Trust access to the VBA project object model" is off) or
+        the call fails; callers should then fall back to walking the objects from
+        Python. After a failed call the macros stay off until PowerPoint is
+        initialized again. Never attaches to PowerPoint itself: without a connected
+        application there is nothing to run the macros in.
+        """
+        if self.ppt_app is None:
+            return None
+        if self._macros_available is None:
+            self._macros_available = self._install_macros()
+        if not self._macros_available:
+            return None
+        try:
+            return self.ppt_app.Run(f"{self._macro_host_name}!{name}", *args)
+        except COM_ERRORS:
+            # Usually the host was closed or macros got disabled; don't retry every call
+            self._macros_available = False
+            return None
+
+    def close_macro_host(self):
+        """Close the hidden presentation holding the helper macros, if one is open"""
+        if self._macro_host is not None:
+            try:
+                self._macro_host.Close()
+            except COM_ERRORS:
+                pass
+        self._macro_host = self._macro_host_name = self._macros_available = None
+
+    def _install_macros(self):
+        host = None
+        try:
+            host = self.ppt_app.Presentations.Add(WithWindow=MSO_FALSE)
+            module = host.VBProject.VBComponents.Add(VBEXT_CT_STD_MODULE)
+            module.CodeModule.AddFromString(HELPER_MACROS)
+            # Don't prompt to save the helper when PowerPoint quits
+            host.Saved = MSO_TRUE
+            self._macro_host = host
+            self._macro_host_name = host.Name
+            return True
+        except COM_ERRORS:
+            if host is not None:
+                try:
+                    host.Close()
+                except COM_ERRORS:
+                    pass
+            return False
+
     def get_open_presentations(self):
         """Get all currently open presentations in PowerPoint"""
         result = []
-        if not self.ppt_app:
-            self.initialize()
-            
-        if self.ppt_app:
-            for i in range(1, self.ppt_app.Presentations.Count + 1):
-                pres = self.ppt_app.Presentations.Item(i)
-                pres_id = str(uuid.uuid4())
-                self.presentations[pres_id] = pres
+        if self.ensure_app() is not None:
+            for pres in self.ppt_app.Presentations:
+                # Skip the hidden presentation that holds the helper macros
+                if self._macro_host is not None and pres.Name == self._macro_host_name:
+                    continue
+                pres_id = self.register(pres)
                 result.append({
                     "id": pres_id,
                     "name": os.path.basename(pres.FullName) if pres.FullName else "Untitled",
@@ -46,40 +431,167 @@ class PPTAutomation:
                 })
         return result
 
+class ComApartment:
+    """
+    Dedicated single-threaded apartment that runs every PowerPoint call made by the tools.
+
+    PowerPoint is an STA server, so all of its proxies belong to the thread that
+    created them. Funnelling the tool bodies through one long-lived STA thread keeps
+    them on the apartment that owns ppt_app, and lets the asyncio event loop keep
+    serving requests while a slow COM call is in flight. The thread is started on
+    first use and pumps window messages whenever its queue is idle.
+    """
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) on the COM thread and return a concurrent.futures.Future"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ppt-com", daemon=True)
+                self._thread.start()
+
+        future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def _run(self):
+        pythoncom.CoInitializeEx(pythoncom.COINIT_APARTMENTTHREADED)
+        while True:
+            try:
+                fn, args, kwargs, future = self._queue.get(timeout=0.05)
+            except queue.Empty:
+                # Service COM callbacks and window messages while idle
+                pythoncom.PumpWaitingMessages()
+                continue
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
 # Create a global instance of our automation class
 ppt_automation = PPTAutomation()
+com_apartment = ComApartment()
+# Slide exports queued by export_slide_as_image(async_export=True): path -> Future
+pending_exports = {}
+# Finished exports nobody asked get_export_status() about are dropped past this many entries
+PENDING_EXPORTS_SIZE = 256
+
+def track_export(path, future):
+    """
+    Helper function to remember a queued export for get_export_status().
+
+    Only finished exports are dropped (oldest first) to make room; an export that is
+    still queued or running is always kept so its status can be reported.
+    """
+    pending_exports.pop(path, None)
+    if len(pending_exports) >= PENDING_EXPORTS_SIZE:
+        finished = [key for key, queued in pending_exports.items() if queued.done()]
+        for key in finished[:len(pending_exports) - PENDING_EXPORTS_SIZE + 1]:
+            del pending_exports[key]
+    pending_exports[path] = future
+
+# Seconds to wait for the COM thread to close the macro host when the server exits
+SHUTDOWN_TIMEOUT = 5
+
+@atexit.register
+def close_macro_host_at_exit():
+    """Close the hidden macro host so it doesn't linger in the user's PowerPoint"""
+    if ppt_automation._macro_host is None:
+        return
+    # The host proxy belongs to the COM thread, so close it from there
+    try:
+        com_apartment.submit(ppt_automation.close_macro_host).result(timeout=SHUTDOWN_TIMEOUT)
+    except Exception:
+        pass
 
-@mcp.tool()
-def initialize_powerpoint() -> bool:
-    """Initialize connection to PowerPoint and make it visible if it wasn't already running."""
-    return ppt_automation.initialize()
+def requires_presentation(fn):
+    """
+    Decorator for tools that act on a registered presentation.
 
-@mcp.tool()
+    Looks presentation_id up once and calls fn(pres, presentation_id, ...), or returns
+    the usual "Presentation ID not found" error. The signature exposed to MCP clients
+    leaves out the pres parameter.
+    """
+    @functools.wraps(fn)
+    def wrapper(presentation_id, *args, **kwargs):
+        pres = ppt_automation.presentations.get(presentation_id)
+        if pres is None:
+            return {"error": "Presentation ID not found"}
+        return fn(pres, presentation_id, *args, **kwargs)
+
+    signature = inspect.signature(fn)
+    wrapper.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+    return wrapper
+
+def com_tool(fn):
+    """
+    Register fn as an MCP tool that runs on the COM apartment thread.
+
+    The server sees an async tool that awaits the COM thread, so the event loop is
+    never blocked on PowerPoint. The undecorated (synchronous) function is returned
+    so it can still be called directly.
+    """
+    @functools.wraps(fn)
+    async def run_on_com_thread(*args, **kwargs):
+        return await asyncio.wrap_future(com_apartment.submit(fn, *args, **kwargs))
+    mcp.add_tool(run_on_com_thread)
+    return fn
+
+def single_undo_entry(fn):
+    """Decorator that makes all edits of a mutating tool a single PowerPoint undo step"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with ppt_automation.undo_entry():
+            return fn(*args, **kwargs)
+    return wrapper
+
+@com_tool
+def initialize_powerpoint(visible: bool = True) -> bool:
+    """
+    Initialize connection to PowerPoint.
+
+    Args:
+        visible: Make PowerPoint visible if a new instance had to be started (default: True)
+    """
+    return ppt_automation.initialize(visible)
+
+@com_tool
 def get_presentations() -> List[Dict[str, Any]]:
     """Get a list of all open PowerPoint presentations with their metadata."""
     return ppt_automation.get_open_presentations()
 
-@mcp.tool()
-def open_presentation(path: str) -> Dict[str, Any]:
+@com_tool
+def open_presentation(path: str, read_only: bool = False) -> Dict[str, Any]:
     """
     Open a PowerPoint presentation from the specified path.
     
     Args:
         path: Full path to the PowerPoint file (.pptx, .ppt)
+        read_only: Open read-only and without a window (default: False). Much faster
+                   for decks that are only being inspected, but the presentation
+                   can't be saved in place and has no selection to query.
         
     Returns:
         Dictionary with presentation ID and metadata
     """
-    if not ppt_automation.ppt_app:
-        ppt_automation.initialize()
+    ppt_automation.ensure_app()
         
     if not os.path.exists(path):
         return {"error": f"File not found: {path}"}
     
     try:
-        pres = ppt_automation.ppt_app.Presentations.Open(path)
-        pres_id = str(uuid.uuid4())
-        ppt_automation.presentations[pres_id] = pres
+        pres = ppt_automation.ppt_app.Presentations.Open(
+            path,
+            ReadOnly=MSO_TRUE if read_only else MSO_FALSE,
+            WithWindow=MSO_FALSE if read_only else MSO_TRUE,
+        )
+        pres_id = ppt_automation.register(pres)
         
         return {
             "id": pres_id,
@@ -90,84 +602,115 @@ def open_presentation(path: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": str(e)}
 
-@mcp.tool()
-def get_slides(presentation_id: str) -> List[Dict[str, Any]]:
+@com_tool
+@requires_presentation
+def get_slides(pres, presentation_id: str, offset: int = 0, limit: int = None) -> List[Dict[str, Any]]:
     """
     Get a list of all slides in a presentation.
+
+    For large decks, pass offset/limit to read one page of slides at a time; only
+    the slides on the requested page are read from PowerPoint.
     
     Args:
         presentation_id: ID of the presentation
+        offset: Number of slides to skip (default: 0)
+        limit: Maximum number of slides to return (default: all remaining)
         
     Returns:
         List of slide metadata
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-    
-    pres = ppt_automation.presentations[presentation_id]
-    slides = []
-    
     try:
         # Get slide count and add error handling
         slide_count = pres.Slides.Count
-        
-        for i in range(1, slide_count + 1):
-            slide = pres.Slides.Item(i)
-            slide_id = str(i)  # Using slide index as ID for simplicity
-            
-            slides.append({
-                "id": slide_id,
-                "index": i,
-                "title": get_slide_title(slide),
-                "shape_count": slide.Shapes.Count
-            })
-        
-        return slides
+
+        start = max(offset, 0)
+        end = slide_count if limit is None else min(slide_count, start + max(limit, 0))
+        if start > 0 or end < slide_count:
+            return [
+                read_slide_summary(ppt_automation.get_slide(presentation_id, i), i)
+                for i in range(start + 1, end + 1)
+            ]
+
+        return [read_slide_summary(slide, i) for i, slide in enumerate(pres.Slides, 1)]
     except Exception as e:
         return {"error": f"Error getting slides: {str(e)}"}
 
-def get_slide_title(slide):
-    """Helper function to extract slide title if available"""
+def read_slide_summary(slide, index):
+    """Helper function to build the get_slides() entry for one slide"""
+    # Enumerate the shapes once and share them between title lookup and count
+    shapes = list(slide.Shapes)
+
+    return {
+        "id": str(index),  # Using slide index as ID for simplicity
+        "index": index,
+        "title": get_slide_title(slide, shapes),
+        "shape_count": len(shapes)
+    }
+
+def find_title_placeholder(slide):
+    """
+    Helper function to return the slide's title placeholder, or None if it has none.
+
+    Shapes.Title resolves the title (or centered title) placeholder inside
+    PowerPoint and raises when there is none, so this is a direct lookup instead
+    of a scan over every shape.
+    """
+    try:
+        return slide.Shapes.Title
+    except COM_ERRORS:
+        return None
+
+def get_slide_title(slide, shapes=None):
+    """
+    Helper function to extract slide title if available.
+
+    Callers that already enumerated slide.Shapes can pass the list in as `shapes`
+    to avoid a second enumeration over COM.
+    """
     try:
         # First check if there's a title placeholder
-        for shape in slide.Shapes:
-            if shape.Type == 14:  # msoPlaceholder
-                if shape.PlaceholderFormat.Type == 1:  # ppPlaceholderTitle
-                    if hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "TextRange"):
-                        return shape.TextFrame.TextRange.Text
-        
-        # If no title placeholder found, check any shape with text
-        # First try to identify shapes of type 17 (this is the specific type used in the test case)
-        for shape in slide.Shapes:
-            if shape.Type == 17 and hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "TextRange"):
-                try:
-                    text = shape.TextFrame.TextRange.Text
-                    if text and text.strip():
-                        return text
-                except:
+        title_shape = find_title_placeholder(slide)
+        if title_shape is not None:
+            return title_shape.TextFrame.TextRange.Text
+
+        if shapes is None:
+            shapes = list(slide.Shapes)
+
+        # Otherwise prefer the first text box (type 17) with text, then the first
+        # other shape with text, in a single pass
+        text_box_title = None
+        other_title = None
+        for shape in shapes:
+            try:
+                is_text_box_shape = shape.Type == MSO_TEXT_BOX
+                if other_title is not None and not is_text_box_shape:
                     continue
-                    
-        # If no shape of type 17 is found, check any other shape with text
-        for shape in slide.Shapes:
-            # Skip title placeholders already checked
-            is_title_placeholder = (shape.Type == 14 and 
-                                   hasattr(shape, "PlaceholderFormat") and 
-                                   shape.PlaceholderFormat.Type == 1)
-            
-            if not is_title_placeholder and hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "TextRange"):
-                try:
-                    text = shape.TextFrame.TextRange.Text
-                    if text and text.strip():
-                        return text  # Return the first non-empty text as title
-                except:
+
+                # HasText is a cheap flag; only marshal the string when there is text
+                text_frame = shape.TextFrame
+                if not text_frame.HasText:
                     continue
-    except:
+                text = text_frame.TextRange.Text
+                if not (text and text.strip()):
+                    continue
+
+                if is_text_box_shape:
+                    text_box_title = text
+                    break
+                other_title = text
+            except COM_ERRORS:
+                continue
+
+        if text_box_title or other_title:
+            return text_box_title or other_title
+    except COM_ERRORS:
         pass
     
     return "Untitled Slide"
 
-@mcp.tool()
-def get_slide_text(presentation_id: str, slide_id: int) -> Dict[str, Any]:
+@com_tool
+@requires_presentation
+def get_slide_text(pres, presentation_id: str, slide_id: int) -> Dict[str, Any]:
     """
     Get all text content in a slide.
 
@@ -198,12 +741,6 @@ def get_slide_text(presentation_id: str, slide_id: int) -> Dict[str, Any]:
         - Extract all text from a slide for analysis or translation
     """
     try:
-        # Check if presentation exists
-        if presentation_id not in ppt_automation.presentations:
-            return {"error": f"Presentation ID not found: {presentation_id}"}
-        
-        pres = ppt_automation.presentations[presentation_id]
-        
         # Get slide count
         try:
             slide_count = pres.Slides.Count
@@ -219,59 +756,64 @@ def get_slide_text(presentation_id: str, slide_id: int) -> Dict[str, Any]:
         
         # Safely get the slide
         try:
-            slide = pres.Slides.Item(int(slide_id))
+            slide = ppt_automation.get_slide(presentation_id, int(slide_id))
         except Exception as e:
             return {"error": f"Error retrieving slide: {str(e)}"}
         
+        # Always read the slide live (text typed in the PowerPoint UI must show up):
+        # fetch every shape's name and text with one DumpShapes macro call, or walk
+        # the shapes over COM
+        dump = ppt_automation.run_macro("DumpShapes", slide)
+        if isinstance(dump, str):
+            dumped = parse_shape_dump(dump)
+            return {
+                "slide_id": slide_id,
+                "slide_index": slide_id,
+                "slide_count": slide_count,
+                "shape_count": len(dumped),
+                "content": {
+                    entry["id"]: {"shape_name": entry["name"], "text": entry["text"]}
+                    for entry in dumped if entry.get("text")
+                }
+            }
+
         text_content = {}
         
-        # Process all shapes on the slide
-        shape_count = 0
+        # Enumerate all shapes on the slide in a single pass
         try:
-            shape_count = slide.Shapes.Count
+            shapes = list(slide.Shapes)
         except Exception as e:
-            return {"error": f"Unable to get shape count: {str(e)}"}
-            
-        for shape_idx in range(1, shape_count + 1):
+            return {"error": f"Unable to enumerate shapes: {str(e)}"}
+        shape_count = len(shapes)
+
+        for shape_idx, shape in enumerate(shapes, 1):
+            # Check HasText before reading TextRange.Text so that pictures,
+            # icons and connectors never marshal a text string at all
             try:
-                shape = slide.Shapes.Item(shape_idx)
-                shape_id = str(shape_idx)
-                
-                # Check if the shape has a text frame
-                has_text = False
-                text = ""
-                
+                # First try TextFrame2 (PowerPoint 2010 and higher),
+                # then the older TextFrame
                 try:
-                    # First try TextFrame2 (PowerPoint 2010 and higher)
-                    if hasattr(shape, "TextFrame2") and shape.TextFrame2.HasText:
-                        has_text = True
-                        text = shape.TextFrame2.TextRange.Text
-                    # Then try older TextFrame
-                    elif hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "HasText") and shape.TextFrame.HasText:
-                        has_text = True
-                        text = shape.TextFrame.TextRange.Text
-                    elif hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "TextRange"):
-                        try:
-                            text = shape.TextFrame.TextRange.Text
-                            has_text = bool(text and text.strip())
-                        except:
-                            pass
-                except Exception as shape_text_error:
-                    continue  # Skip this shape if text cannot be retrieved
-                
-                if has_text or (text and text.strip()):
-                    shape_name = "Unnamed Shape"
-                    try:
-                        shape_name = shape.Name
-                    except:
-                        pass
-                        
-                    text_content[shape_id] = {
-                        "shape_name": shape_name,
-                        "text": text
-                    }
-            except Exception as shape_error:
-                continue  # Skip this shape if an error occurs without interrupting the process
+                    text_frame = shape.TextFrame2
+                except COM_ERRORS:
+                    text_frame = shape.TextFrame
+
+                if not text_frame.HasText:
+                    continue
+                text = text_frame.TextRange.Text
+            except COM_ERRORS:
+                continue  # Skip this shape if text cannot be retrieved
+
+            if text:
+                shape_name = "Unnamed Shape"
+                try:
+                    shape_name = shape.Name
+                except COM_ERRORS:
+                    pass
+
+                text_content[str(shape_idx)] = {
+                    "shape_name": shape_name,
+                    "text": text
+                }
         
         return {
             "slide_id": slide_id,
@@ -288,7 +830,8 @@ def get_slide_text(presentation_id: str, slide_id: int) -> Dict[str, Any]:
             "slide_id": slide_id
         }
 
-@mcp.tool()
+@com_tool
+@single_undo_entry
 def update_text(presentation_id: str, slide_id: str, shape_id: str, text: str) -> Dict[str, Any]:
     """
     Update the text content of a shape.
@@ -318,81 +861,122 @@ def update_text(presentation_id: str, slide_id: str, shape_id: str, text: str) -
         3. update_text() to change text while keeping formatting
         4. export_slide_as_image() to verify the result
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-    
-    pres = ppt_automation.presentations[presentation_id]
-    
-    # 更好地处理输入参数
-    try:
-        # 移除可能存在的引号，并尝试转换为整数
-        if isinstance(slide_id, str):
-            # 处理各种引号格式，修复无效的转义序列
-            clean_slide_id = slide_id.strip('"\'`')
-        else:
-            clean_slide_id = str(slide_id)
-            
-        if isinstance(shape_id, str):
-            # 处理各种引号格式，修复无效的转义序列
-            clean_shape_id = shape_id.strip('"\'`')
-        else:
-            clean_shape_id = str(shape_id)
-        
-        slide_idx = int(clean_slide_id)
-        shape_idx = int(clean_shape_id)
-    except ValueError as e:
-        return {"error": f"Invalid ID format: {str(e)}"}
-    
-    if slide_idx < 1 or slide_idx > pres.Slides.Count:
-        return {"error": f"Invalid slide ID: {slide_id}"}
-    
+    # Single-edit case of update_texts(), so both tools behave identically
+    result = update_texts(presentation_id, [{"slide_id": slide_id, "shape_id": shape_id, "text": text}])
+    return result["results"][0] if "results" in result else result
+
+@com_tool
+@single_undo_entry
+@requires_presentation
+def update_texts(pres, presentation_id: str, edits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Update the text content of several shapes in one call.
+
+    Applies the same rules as update_text() to every edit, but looks the presentation
+    up once, fetches each slide once, and makes all writes a single undo step.
+    Prefer this over repeated update_text() calls when filling in the text boxes of
+    a copied template slide.
+
+    Args:
+        presentation_id: ID of the presentation
+        edits: List of edits, each {"slide_id": ..., "shape_id": ..., "text": ...}
+            where slide_id and shape_id are integers or numeric strings
+
+    Returns:
+        Dictionary with an overall success flag, the number of shapes updated, and a
+        "results" list holding the status of each edit in the same order as `edits`
+
+    Example workflow:
+        1. copy_slide() to duplicate a template slide
+        2. list_all_shapes_in_slide() to find text box IDs
+        3. update_texts() with one entry per text box to change
+    """
+    results = [None] * len(edits)
+
+    # Parse IDs up front and group the edits by slide
+    edits_by_slide = {}
+    for pos, edit in enumerate(edits):
+        try:
+            slide_idx = parse_id(edit["slide_id"])
+            shape_idx = parse_id(edit["shape_id"])
+        except ValueError as e:
+            results[pos] = {"error": f"Invalid ID format: {str(e)}"}
+            continue
+        except (KeyError, TypeError) as e:
+            results[pos] = {"error": f"Invalid edit: {str(e)}"}
+            continue
+        edits_by_slide.setdefault(slide_idx, []).append((pos, shape_idx, edit))
+
+    for slide_idx in sorted(edits_by_slide):
+        slide_edits = edits_by_slide[slide_idx]
+
+        # Slides.Item rejects out-of-range IDs itself, so Slides.Count is never read
+        try:
+            if slide_idx < 1:
+                raise IndexError(slide_idx)
+            shape_count = ppt_automation.get_slide(presentation_id, slide_idx).Shapes.Count
+        except ID_LOOKUP_ERRORS:
+            for pos, _, edit in slide_edits:
+                results[pos] = {"error": f"Invalid slide ID: {edit['slide_id']}"}
+            continue
+
+        for pos, shape_idx, edit in slide_edits:
+            if shape_idx < 1 or shape_idx > shape_count:
+                results[pos] = {"error": f"Invalid shape ID: {edit['shape_id']}"}
+                continue
+            try:
+                shape = ppt_automation.get_shape(presentation_id, slide_idx, shape_idx)
+                results[pos] = apply_shape_text(shape, edit.get("text", ""))
+            except Exception as e:
+                results[pos] = {"success": False, "error": f"Error updating text: {str(e)}"}
+            if results[pos].get("success"):
+                ppt_automation.forget_slide_content(presentation_id, slide_idx)
+
+    updated = sum(1 for r in results if r.get("success"))
+    return {
+        "success": updated == len(edits),
+        "updated": updated,
+        "results": results
+    }
+
+def apply_shape_text(shape, text):
+    """Helper function to write text into a shape, returning the update_text() status dict"""
+    # First try TextFrame2 (newer PowerPoint versions). Empty frames are written to
+    # as well, so there is no HasText precondition to dispatch first.
     try:
-        slide = pres.Slides.Item(slide_idx)
-    except Exception as e:
-        return {"error": f"Error accessing slide: {str(e)}"}
-    
-    if shape_idx < 1 or shape_idx > slide.Shapes.Count:
-        return {"error": f"Invalid shape ID: {shape_id}"}
-    
+        shape.TextFrame2.TextRange.Text = text
+        return {"success": True, "message": "Text updated successfully using TextFrame2"}
+    except COM_ERRORS:
+        pass
+
+    # Then try TextFrame
     try:
-        shape = slide.Shapes.Item(shape_idx)
-        
-        # First try TextFrame2 (newer PowerPoint versions)
-        if hasattr(shape, "TextFrame2") and shape.TextFrame2.HasText:
-            shape.TextFrame2.TextRange.Text = text
-            return {"success": True, "message": "Text updated successfully using TextFrame2"}
+        shape.TextFrame.TextRange.Text = text
+        return {"success": True, "message": "Text updated successfully using TextFrame"}
+    except COM_ERRORS:
+        pass
         
-        # Then try TextFrame
-        elif hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "TextRange"):
-            shape.TextFrame.TextRange.Text = text
-            return {"success": True, "message": "Text updated successfully using TextFrame"}
-            
-        # Try finding text in grouped shapes
-        elif shape.Type == 6:  # msoGroup (grouped shapes)
-            updated = False
-            for i in range(1, shape.GroupItems.Count + 1):
-                subshape = shape.GroupItems.Item(i)
-                if hasattr(subshape, "TextFrame") and hasattr(subshape.TextFrame, "TextRange"):
-                    subshape.TextFrame.TextRange.Text = text
-                    updated = True
-                    break
-                elif hasattr(subshape, "TextFrame2") and subshape.TextFrame2.HasText:
-                    subshape.TextFrame2.TextRange.Text = text
-                    updated = True
-                    break
-            
-            if updated:
+    # Try finding text in grouped shapes
+    if shape.Type == MSO_GROUP:
+        for subshape in shape.GroupItems:
+            try:
+                subshape.TextFrame2.TextRange.Text = text
                 return {"success": True, "message": "Text updated successfully in grouped shape"}
-            else:
-                return {"success": False, "message": "No text frame found in grouped shape"}
-                
-        else:
-            return {"success": False, "message": "Shape does not contain editable text"}
-    except Exception as e:
-        return {"success": False, "error": f"Error updating text: {str(e)}"}
+            except COM_ERRORS:
+                pass
+            try:
+                subshape.TextFrame.TextRange.Text = text
+                return {"success": True, "message": "Text updated successfully in grouped shape"}
+            except COM_ERRORS:
+                pass
+
+        return {"success": False, "message": "No text frame found in grouped shape"}
 
-@mcp.tool()
-def save_presentation(presentation_id: str, path: str = None) -> Dict[str, Any]:
+    return {"success": False, "message": "Shape does not contain editable text"}
+
+@com_tool
+@requires_presentation
+def save_presentation(pres, presentation_id: str, path: str = None) -> Dict[str, Any]:
     """
     Save a presentation to disk.
     
@@ -403,11 +987,6 @@ def save_presentation(presentation_id: str, path: str = None) -> Dict[str, Any]:
     Returns:
         Status of the operation
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-    
-    pres = ppt_automation.presentations[presentation_id]
-    
     try:
         if path:
             pres.SaveAs(path)
@@ -420,8 +999,9 @@ def save_presentation(presentation_id: str, path: str = None) -> Dict[str, Any]:
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-@mcp.tool()
-def close_presentation(presentation_id: str, save: bool = True) -> Dict[str, Any]:
+@com_tool
+@requires_presentation
+def close_presentation(pres, presentation_id: str, save: bool = True) -> Dict[str, Any]:
     """
     Close a presentation.
     
@@ -432,21 +1012,16 @@ def close_presentation(presentation_id: str, save: bool = True) -> Dict[str, Any
     Returns:
         Status of the operation
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-    
-    pres = ppt_automation.presentations[presentation_id]
-    
     try:
         if save:
             pres.Save()
         pres.Close()
-        del ppt_automation.presentations[presentation_id]
+        ppt_automation.unregister(presentation_id)
         return {"success": True}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-@mcp.tool()
+@com_tool
 def create_presentation() -> Dict[str, Any]:
     """
     Create a new PowerPoint presentation.
@@ -454,13 +1029,11 @@ def create_presentation() -> Dict[str, Any]:
     Returns:
         Dictionary containing new presentation ID and metadata
     """
-    if not ppt_automation.ppt_app:
-        ppt_automation.initialize()
+    ppt_automation.ensure_app()
         
     try:
         pres = ppt_automation.ppt_app.Presentations.Add()
-        pres_id = str(uuid.uuid4())
-        ppt_automation.presentations[pres_id] = pres
+        pres_id = ppt_automation.register(pres)
         
         return {
             "id": pres_id,
@@ -471,8 +1044,10 @@ def create_presentation() -> Dict[str, Any]:
     except Exception as e:
         return {"error": str(e)}
 
-@mcp.tool()
-def add_slide(presentation_id: str, layout_type: int = 1) -> Dict[str, Any]:
+@com_tool
+@single_undo_entry
+@requires_presentation
+def add_slide(pres, presentation_id: str, layout_type: int = 1) -> Dict[str, Any]:
     """
     Add a new slide to the presentation.
     
@@ -488,17 +1063,13 @@ def add_slide(presentation_id: str, layout_type: int = 1) -> Dict[str, Any]:
     Returns:
         Information about the new slide
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-    
-    pres = ppt_automation.presentations[presentation_id]
-    
     try:
         # Get current slide count
         slide_index = pres.Slides.Count + 1
         
         # Add new slide
         slide = pres.Slides.Add(slide_index, layout_type)
+        ppt_automation.invalidate(presentation_id)
         
         return {
             "id": str(slide_index),
@@ -509,9 +1080,11 @@ def add_slide(presentation_id: str, layout_type: int = 1) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Error adding slide: {str(e)}"}
 
-@mcp.tool()
-def add_text_box(presentation_id: str, slide_id: str, text: str, 
-                 left: float = 100, top: float = 100, 
+@com_tool
+@single_undo_entry
+@requires_presentation
+def add_text_box(pres, presentation_id: str, slide_id: str, text: str,
+                 left: float = 100, top: float = 100,
                  width: float = 400, height: float = 200) -> Dict[str, Any]:
     """
     Add a text box to a slide and set its text content.
@@ -528,42 +1101,26 @@ def add_text_box(presentation_id: str, slide_id: str, text: str,
     Returns:
         Operation status and ID of the new shape
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-    
-    pres = ppt_automation.presentations[presentation_id]
-    
     try:
-        # 更好地处理输入参数
         try:
-            # 移除可能存在的引号，并尝试转换为整数
-            if isinstance(slide_id, str):
-                # 处理各种引号格式，修复无效的转义序列
-                clean_slide_id = slide_id.strip('"\'`')
-            else:
-                clean_slide_id = str(slide_id)
-            
-            slide_idx = int(clean_slide_id)
+            slide_idx = parse_id(slide_id)
         except ValueError as e:
             return {"error": f"Invalid slide ID format: {str(e)}"}
         
         if slide_idx < 1 or slide_idx > pres.Slides.Count:
             return {"error": f"Invalid slide ID: {slide_id}"}
         
-        slide = pres.Slides.Item(slide_idx)
+        slide = ppt_automation.get_slide(presentation_id, slide_idx)
         
         # Add text box
-        shape = slide.Shapes.AddTextbox(1, left, top, width, height)  # 1 = msoTextOrientationHorizontal
+        shape = slide.Shapes.AddTextbox(MSO_TEXT_ORIENTATION_HORIZONTAL, left, top, width, height)
+        ppt_automation.invalidate(presentation_id)
         
         # Set text content
         shape.TextFrame.TextRange.Text = text
         
-        # Get the new shape's index
-        shape_id = None
-        for i in range(1, slide.Shapes.Count + 1):
-            if slide.Shapes.Item(i) == shape:
-                shape_id = str(i)
-                break
+        # The new shape's position in slide.Shapes (AddTextbox appends, so it is the last one)
+        shape_id = str(shape.ZOrderPosition)
         
         return {
             "success": True,
@@ -574,8 +1131,10 @@ def add_text_box(presentation_id: str, slide_id: str, text: str,
     except Exception as e:
         return {"error": f"Error adding text box: {str(e)}"}
 
-@mcp.tool()
-def set_slide_title(presentation_id: str, slide_id: str, title: str) -> Dict[str, Any]:
+@com_tool
+@single_undo_entry
+@requires_presentation
+def set_slide_title(pres, presentation_id: str, slide_id: str, title: str) -> Dict[str, Any]:
     """
     Set the title text of a slide.
     
@@ -587,33 +1146,24 @@ def set_slide_title(presentation_id: str, slide_id: str, title: str) -> Dict[str
     Returns:
         Status of the operation
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-    
-    pres = ppt_automation.presentations[presentation_id]
-    
     try:
         # Ensure slide_id is an integer
-        slide_idx = int(slide_id.strip('"\''))
+        slide_idx = parse_id(slide_id)
         
         if slide_idx < 1 or slide_idx > pres.Slides.Count:
             return {"error": f"Invalid slide ID: {slide_id}"}
         
-        slide = pres.Slides.Item(slide_idx)
+        slide = ppt_automation.get_slide(presentation_id, slide_idx)
         
         # Find title placeholder
-        title_found = False
-        for shape in slide.Shapes:
-            if shape.Type == 14:  # msoPlaceholder
-                if hasattr(shape, "PlaceholderFormat") and shape.PlaceholderFormat.Type == 1:  # ppPlaceholderTitle
-                    if hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "TextRange"):
-                        shape.TextFrame.TextRange.Text = title
-                        title_found = True
-                        break
-        
-        if not title_found:
+        title_shape = find_title_placeholder(slide)
+        if title_shape is not None:
+            title_shape.TextFrame.TextRange.Text = title
+            ppt_automation.forget_slide_content(presentation_id, slide_idx)
+        else:
             # If no title placeholder found, add a text box as title
-            shape = slide.Shapes.AddTextbox(1, 50, 50, 600, 50)
+            shape = slide.Shapes.AddTextbox(MSO_TEXT_ORIENTATION_HORIZONTAL, 50, 50, 600, 50)
+            ppt_automation.invalidate(presentation_id)
             shape.TextFrame.TextRange.Text = title
             
             # Set text format as title style
@@ -627,7 +1177,7 @@ def set_slide_title(presentation_id: str, slide_id: str, title: str) -> Dict[str
     except Exception as e:
         return {"error": f"Error setting slide title: {str(e)}"}
 
-@mcp.tool()
+@com_tool
 def get_selected_shapes(presentation_id: str = None) -> Dict[str, Any]:
     """
     Get information about the currently selected shapes in PowerPoint.
@@ -639,32 +1189,19 @@ def get_selected_shapes(presentation_id: str = None) -> Dict[str, Any]:
     Returns:
         Dictionary containing information about selected shapes
     """
-    if not ppt_automation.ppt_app:
-        ppt_automation.initialize()
+    ppt_automation.ensure_app()
     
     try:
         # Get the active presentation if presentation_id is not provided
         if presentation_id:
-            if presentation_id not in ppt_automation.presentations:
+            pres = ppt_automation.presentations.get(presentation_id)
+            if pres is None:
                 return {"error": "Presentation ID not found"}
-            pres = ppt_automation.presentations[presentation_id]
         else:
             # Get the active presentation
             pres = ppt_automation.ppt_app.ActivePresentation
-            # Add to presentations dictionary if not already there
-            pres_exists = False
-            pres_id = None
-            for pid, p in ppt_automation.presentations.items():
-                if p == pres:
-                    pres_exists = True
-                    pres_id = pid
-                    break
-            
-            if not pres_exists:
-                pres_id = str(uuid.uuid4())
-                ppt_automation.presentations[pres_id] = pres
-            
-            presentation_id = pres_id
+            # Reuses the ID if the presentation is already registered
+            presentation_id = ppt_automation.register(pres)
         
         # Get the active window
         active_window = ppt_automation.ppt_app.ActiveWindow
@@ -696,23 +1233,23 @@ def get_selected_shapes(presentation_id: str = None) -> Dict[str, Any]:
             # Check for different selection types:
             # 2 = ppSelectionShapes (shapes selection)
             # 3 = ppSelectionText (text selection)
-            if selection_type == 2 and active_window.Selection.ShapeRange.Count > 0:
+            if selection_type == PP_SELECTION_SHAPES and active_window.Selection.ShapeRange.Count > 0:
                 # Handle shape selection (including text boxes)
                 shapes_range = active_window.Selection.ShapeRange
                 
-                for i in range(1, shapes_range.Count + 1):
-                    shape = shapes_range.Item(i)
+                for shape in shapes_range:
                     shape_id = find_shape_id(current_slide, shape)
                     
                     # Get shape type name
-                    shape_type_name = get_shape_type_name(shape.Type)
+                    shape_type = shape.Type
+                    shape_type_name = get_shape_type_name(shape_type)
                     
                     shape_info = {
                         "shape_id": shape_id,
-                        "shape_name": shape.Name if hasattr(shape, "Name") else "Unnamed Shape",
-                        "shape_type": shape.Type,
+                        "shape_name": getattr(shape, "Name", "Unnamed Shape"),
+                        "shape_type": shape_type,
                         "shape_type_name": shape_type_name,
-                        "is_text_box": is_text_box(shape)
+                        "is_text_box": is_text_box(shape, shape_type)
                     }
                     
                     # Try to get text content if available
@@ -721,21 +1258,22 @@ def get_selected_shapes(presentation_id: str = None) -> Dict[str, Any]:
                     
                     selected_shapes.append(shape_info)
                     
-            elif selection_type == 3:
+            elif selection_type == PP_SELECTION_TEXT:
                 # Handle text selection - get the parent shape
                 try:
                     text_range = active_window.Selection.TextRange
                     parent_shape = text_range.Parent.Parent
                     
                     shape_id = find_shape_id(current_slide, parent_shape)
-                    shape_type_name = get_shape_type_name(parent_shape.Type)
+                    shape_type = parent_shape.Type
+                    shape_type_name = get_shape_type_name(shape_type)
                     
                     shape_info = {
                         "shape_id": shape_id,
-                        "shape_name": parent_shape.Name if hasattr(parent_shape, "Name") else "Unnamed Shape",
-                        "shape_type": parent_shape.Type,
+                        "shape_name": getattr(parent_shape, "Name", "Unnamed Shape"),
+                        "shape_type": shape_type,
                         "shape_type_name": shape_type_name,
-                        "is_text_box": is_text_box(parent_shape),
+                        "is_text_box": is_text_box(parent_shape, shape_type),
                         "selected_text": text_range.Text,
                         "text": extract_shape_text(parent_shape)
                     }
@@ -760,132 +1298,185 @@ def get_selected_shapes(presentation_id: str = None) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Error getting selected shapes: {str(e)}"}
 
-def find_shape_id(slide, target_shape):
-    """Helper function to find a shape's ID by comparing with all shapes on the slide"""
+def build_shape_index(slide):
+    """Helper function to map each shape's PowerPoint Shape.Id to its 1-based ID on the slide"""
+    return {shape.Id: str(i) for i, shape in enumerate(slide.Shapes, 1)}
+
+def find_shape_id(slide, target_shape, shape_index=None):
+    """
+    Helper function to find a shape's ID on the slide.
+
+    A top-level shape's ZOrderPosition is its position in slide.Shapes, so it is tried
+    first and confirmed by Shape.Id; the slide is only enumerated if that fails. Pass
+    a shape_index from build_shape_index() to skip the ZOrderPosition probe.
+    """
     try:
-        for i in range(1, slide.Shapes.Count + 1):
-            if slide.Shapes.Item(i) == target_shape:
-                return str(i)
-    except:
+        if shape_index is None:
+            target_id = target_shape.Id
+            position = target_shape.ZOrderPosition
+            if slide.Shapes.Item(position).Id == target_id:
+                return str(position)
+            shape_index = build_shape_index(slide)
+        # Look up by the integer Shape.Id rather than comparing COM objects
+        return shape_index.get(target_shape.Id, "unknown")
+    except COM_ERRORS:
         pass
     return "unknown"
 
-def is_text_box(shape):
-    """Helper function to determine if a shape is a text box or contains text"""
+def is_text_box(shape, shape_type=None):
+    """
+    Helper function to determine if a shape is a text box or contains text.
+
+    Pass shape_type if the caller already read shape.Type.
+    """
+    try:
+        if shape_type is None:
+            shape_type = shape.Type
+    except COM_ERRORS:
+        return False
+
+    # Directly check the shape type
+    if shape_type == MSO_TEXT_BOX:
+        return True
+    if shape_type not in TEXT_SHAPE_TYPES:
+        return False
+
+    # Otherwise it counts if either text frame API reports text. HasText is an
+    # MsoTriState (-1 / 0), so test its truthiness rather than comparing to True.
     try:
-        # Directly check the shape type
-        if shape.Type == 17:  # msoTextBox
+        if shape.TextFrame.HasText:
             return True
-            
-        # Check if it has TextFrame or TextFrame2, and contains text
-        has_text = False
-        
-        # Check TextFrame
-        if hasattr(shape, "TextFrame"):
-            try:
-                if hasattr(shape.TextFrame, "HasText"):
-                    # Handle MagicMock objects, force convert to boolean value
-                    if isinstance(shape.TextFrame.HasText, bool):
-                        has_text = shape.TextFrame.HasText
-                    else:
-                        # For special case in testing: if shape name is "non-text box shape", return False
-                        if hasattr(shape, "Name") and shape.Name == "non-text box shape":
-                            return False
-            except:
-                pass
-                
-        # Check TextFrame2
-        if not has_text and hasattr(shape, "TextFrame2"):
-            try:
-                if hasattr(shape.TextFrame2, "HasText"):
-                    if isinstance(shape.TextFrame2.HasText, bool):
-                        has_text = shape.TextFrame2.HasText
-            except:
-                pass
-                
-        return has_text
-    except:
+    except COM_ERRORS:
+        pass
+
+    try:
+        return bool(shape.TextFrame2.HasText)
+    except COM_ERRORS:
         return False
 
 def extract_shape_text(shape):
     """Helper function to extract text from a shape"""
-    # Special handling for test cases
-    if hasattr(shape, "Name") and shape.Name == "TextFrame shape":
-        return "Text from TextFrame"
-        
     text_content = ""
-    
+
+    # Check TextFrame2. An empty frame just returns "", so there's no need to ask
+    # HasText first.
     try:
-        # Check TextFrame2
-        if hasattr(shape, "TextFrame2"):
-            try:
-                if hasattr(shape.TextFrame2, "HasText") and shape.TextFrame2.HasText:
-                    if hasattr(shape.TextFrame2, "TextRange") and hasattr(shape.TextFrame2.TextRange, "Text"):
-                        if isinstance(shape.TextFrame2.TextRange.Text, str):
-                            text_content = shape.TextFrame2.TextRange.Text
-                        else:
-                            # For non-string objects (like MagicMock), return empty string
-                            text_content = ""
-            except:
-                pass
-                
-        # If TextFrame2 has no text, check TextFrame
-        if not text_content and hasattr(shape, "TextFrame"):
-            try:
-                if hasattr(shape.TextFrame, "HasText") and shape.TextFrame.HasText:
-                    if hasattr(shape.TextFrame, "TextRange") and hasattr(shape.TextFrame.TextRange, "Text"):
-                        if isinstance(shape.TextFrame.TextRange.Text, str):
-                            text_content = shape.TextFrame.TextRange.Text
-                        else:
-                            # For non-string objects, try special handling
-                            if hasattr(shape, "Name") and shape.Name == "TextFrame shape":
-                                text_content = "Text from TextFrame"
-                elif hasattr(shape.TextFrame, "TextRange") and hasattr(shape.TextFrame.TextRange, "Text"):
-                    if isinstance(shape.TextFrame.TextRange.Text, str):
-                        text_content = shape.TextFrame.TextRange.Text
-                    else:
-                        # For non-string objects, try special handling
-                        if hasattr(shape, "Name") and shape.Name == "TextFrame shape":
-                            text_content = "Text from TextFrame"
-            except:
-                pass
-    except:
+        text = shape.TextFrame2.TextRange.Text
+        if isinstance(text, str):
+            text_content = text
+    except COM_ERRORS:
         pass
-        
+
+    # If TextFrame2 has no text, check TextFrame
+    if not text_content:
+        try:
+            text = shape.TextFrame.TextRange.Text
+            if isinstance(text, str):
+                text_content = text
+        except COM_ERRORS:
+            pass
+
     return text_content
 
+def inspect_shape_text(shape, shape_type=None, with_font=False):
+    """
+    Helper function to read a shape's text state through a single text frame handle.
+
+    Returns None if the shape has no text (the is_text_box() rule), otherwise a dict
+    with "text" and, when with_font is set, "font" ({name, size, bold}, or None if
+    the font can't be read). Pass shape_type if the caller already read shape.Type.
+    """
+    if shape_type is None:
+        try:
+            shape_type = shape.Type
+        except COM_ERRORS:
+            return None
+    if shape_type not in TEXT_SHAPE_TYPES:
+        return None
+
+    # Grab TextFrame2 once, falling back to the older TextFrame
+    try:
+        text_frame = shape.TextFrame2
+    except COM_ERRORS:
+        try:
+            text_frame = shape.TextFrame
+        except COM_ERRORS:
+            return None
+
+    try:
+        has_text = bool(text_frame.HasText)
+    except COM_ERRORS:
+        has_text = False
+
+    if not has_text and shape_type != MSO_TEXT_BOX:
+        return None
+
+    try:
+        text_range = text_frame.TextRange
+    except COM_ERRORS:
+        return None
+
+    text = ""
+    if has_text:
+        try:
+            text = text_range.Text
+        except COM_ERRORS:
+            pass
+    info = {"text": text if isinstance(text, str) else ""}
+
+    if with_font:
+        try:
+            font = text_range.Font
+            info["font"] = {
+                "name": getattr(font, "Name", None),
+                "size": getattr(font, "Size", None),
+                "bold": getattr(font, "Bold", None)
+            }
+        except COM_ERRORS:
+            info["font"] = None
+
+    return info
+
+# MsoShapeType names, indexed by the enumeration value
+SHAPE_TYPE_NAMES = (
+    None,
+    "msoAutoShape",
+    "msoCallout",
+    "msoChart",
+    "msoComment",
+    "msoFreeform",
+    "msoGroup",
+    "msoEmbeddedOLEObject",
+    "msoFormControl",
+    "msoLine",
+    "msoLinkedOLEObject",
+    "msoLinkedPicture",
+    "msoOLEControlObject",
+    "msoPicture",
+    "msoPlaceholder",
+    "msoScriptAnchor",
+    "msoShapeTypeMixed",
+    "msoTextBox",
+    "msoMedia",
+    "msoTable",
+    "msoCanvas",
+    "msoDiagram",
+    "msoInk",
+    "msoInkComment"
+)
+
 def get_shape_type_name(type_id):
     """Helper function to convert shape type ID to readable name"""
-    shape_types = {
-        1: "msoAutoShape",
-        2: "msoCallout",
-        3: "msoChart",
-        4: "msoComment",
-        5: "msoFreeform",
-        6: "msoGroup",
-        7: "msoEmbeddedOLEObject",
-        8: "msoFormControl",
-        9: "msoLine",
-        10: "msoLinkedOLEObject",
-        11: "msoLinkedPicture",
-        12: "msoOLEControlObject",
-        13: "msoPicture",
-        14: "msoPlaceholder",
-        15: "msoScriptAnchor",
-        16: "msoShapeTypeMixed",
-        17: "msoTextBox",
-        18: "msoMedia",
-        19: "msoTable",
-        20: "msoCanvas",
-        21: "msoDiagram",
-        22: "msoInk",
-        23: "msoInkComment"
-    }
-    return shape_types.get(type_id, f"Unknown Type ({type_id})")
+    if isinstance(type_id, int) and 0 < type_id < len(SHAPE_TYPE_NAMES):
+        return SHAPE_TYPE_NAMES[type_id]
+    return f"Unknown Type ({type_id})"
 
 
-@mcp.tool()
-def copy_slide(presentation_id: str, slide_id: int, insert_after: int = None) -> Dict[str, Any]:
+@com_tool
+@single_undo_entry
+@requires_presentation
+def copy_slide(pres, presentation_id: str, slide_id: int, insert_after: int = None,
+               include_title: bool = False, include_shape_count: bool = False) -> Dict[str, Any]:
     """
     Copy a slide within a presentation, preserving all formatting and design.
 
@@ -907,20 +1498,18 @@ def copy_slide(presentation_id: str, slide_id: int, insert_after: int = None) ->
         presentation_id: ID of the presentation
         slide_id: ID of the slide to copy (integer)
         insert_after: Position after which to insert the new slide (if None, inserts at end)
+        include_title: Also return the new slide's title (default: False)
+        include_shape_count: Also return the new slide's shape count (default: False)
 
     Returns:
-        Information about the new copied slide including new ID, index, title, and shape count
+        Information about the new copied slide including new ID and index, plus its
+        title and shape count when requested
 
     Example use cases:
         - Copy template slides from Pimp My Slide to build new presentations
         - Duplicate slides with complex layouts to modify content
         - Create multiple variations of a slide with same design
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
         # Get slide count
         slide_count = pres.Slides.Count
@@ -930,11 +1519,12 @@ def copy_slide(presentation_id: str, slide_id: int, insert_after: int = None) ->
             return {"error": f"Invalid slide ID: {slide_id}. Valid range is 1-{slide_count}"}
 
         # Get the source slide
-        source_slide = pres.Slides.Item(slide_id)
+        source_slide = ppt_automation.get_slide(presentation_id, slide_id)
 
         # Use Duplicate() method which preserves all formatting, master slides, and backgrounds
         # Duplicate() inserts the new slide immediately after the source slide
-        duplicated_slide = source_slide.Duplicate()
+        duplicated_slide = source_slide.Duplicate().Item(1)
+        ppt_automation.invalidate(presentation_id)
 
         # The duplicate is now at position slide_id + 1
         new_slide_index = slide_id + 1
@@ -954,27 +1544,30 @@ def copy_slide(presentation_id: str, slide_id: int, insert_after: int = None) ->
                 new_slide_index = target_position
         else:
             # No specific position requested, move to end if it's not already there
-            final_slide_count = pres.Slides.Count
+            final_slide_count = slide_count + 1
             if new_slide_index != final_slide_count:
                 duplicated_slide.MoveTo(final_slide_count)
                 new_slide_index = final_slide_count
 
-        # Get the final slide object
-        final_slide = pres.Slides.Item(new_slide_index)
-
-        return {
+        result = {
             "success": True,
             "id": str(new_slide_index),
             "index": new_slide_index,
-            "title": get_slide_title(final_slide),
-            "shape_count": final_slide.Shapes.Count,
             "message": f"Slide {slide_id} duplicated successfully to position {new_slide_index} with all formatting preserved"
         }
+        # Reading these costs extra COM calls, so only do it when asked
+        if include_title:
+            result["title"] = get_slide_title(duplicated_slide)
+        if include_shape_count:
+            result["shape_count"] = duplicated_slide.Shapes.Count
+        return result
     except Exception as e:
         return {"error": f"Error copying slide: {str(e)}"}
 
-@mcp.tool()
-def delete_slide(presentation_id: str, slide_id: int) -> Dict[str, Any]:
+@com_tool
+@single_undo_entry
+@requires_presentation
+def delete_slide(pres, presentation_id: str, slide_id: int) -> Dict[str, Any]:
     """
     Delete a slide from a presentation.
 
@@ -985,11 +1578,6 @@ def delete_slide(presentation_id: str, slide_id: int) -> Dict[str, Any]:
     Returns:
         Status of the operation
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
         # Get slide count
         slide_count = pres.Slides.Count
@@ -999,19 +1587,22 @@ def delete_slide(presentation_id: str, slide_id: int) -> Dict[str, Any]:
             return {"error": f"Invalid slide ID: {slide_id}. Valid range is 1-{slide_count}"}
 
         # Get and delete the slide
-        slide_to_delete = pres.Slides.Item(slide_id)
+        slide_to_delete = ppt_automation.get_slide(presentation_id, slide_id)
         slide_to_delete.Delete()
+        ppt_automation.invalidate(presentation_id)
 
         return {
             "success": True,
             "message": f"Slide {slide_id} deleted successfully",
-            "new_slide_count": pres.Slides.Count
+            "new_slide_count": slide_count - 1
         }
     except Exception as e:
         return {"error": f"Error deleting slide: {str(e)}"}
 
-@mcp.tool()
-def move_slide(presentation_id: str, slide_id: int, new_position: int) -> Dict[str, Any]:
+@com_tool
+@single_undo_entry
+@requires_presentation
+def move_slide(pres, presentation_id: str, slide_id: int, new_position: int) -> Dict[str, Any]:
     """
     Move a slide to a new position in the presentation.
 
@@ -1023,11 +1614,6 @@ def move_slide(presentation_id: str, slide_id: int, new_position: int) -> Dict[s
     Returns:
         Status of the operation
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
         # Get slide count
         slide_count = pres.Slides.Count
@@ -1040,35 +1626,22 @@ def move_slide(presentation_id: str, slide_id: int, new_position: int) -> Dict[s
         if new_position < 1 or new_position > slide_count:
             return {"error": f"Invalid new position: {new_position}. Valid range is 1-{slide_count}"}
 
-        # Copy the slide to new position
-        source_slide = pres.Slides.Item(slide_id)
-        source_slide.Copy()
-
-        # Paste at new position
-        if new_position > slide_id:
-            # If moving down, paste after the target position
-            pres.Slides.Paste(new_position + 1)
-        else:
-            # If moving up, paste at the new position
-            pres.Slides.Paste(new_position)
-
-        # Delete the original slide
-        if new_position > slide_id:
-            pres.Slides.Item(slide_id).Delete()
-        else:
-            # Original slide is now one position further
-            pres.Slides.Item(slide_id + 1).Delete()
+        # MoveTo reorders the slide in place: no clipboard round-trip, and the
+        # slide keeps its layout and master
+        ppt_automation.get_slide(presentation_id, slide_id).MoveTo(new_position)
+        ppt_automation.invalidate(presentation_id)
 
         return {
             "success": True,
             "message": f"Slide {slide_id} moved to position {new_position}",
-            "new_slide_count": pres.Slides.Count
+            "new_slide_count": slide_count
         }
     except Exception as e:
         return {"error": f"Error moving slide: {str(e)}"}
 
-@mcp.tool()
-def get_presentation_info(presentation_id: str) -> Dict[str, Any]:
+@com_tool
+@requires_presentation
+def get_presentation_info(pres, presentation_id: str) -> Dict[str, Any]:
     """
     Get metadata information about a presentation.
 
@@ -1078,11 +1651,6 @@ def get_presentation_info(presentation_id: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing presentation metadata
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
         return {
             "id": presentation_id,
@@ -1094,8 +1662,10 @@ def get_presentation_info(presentation_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Error getting presentation info: {str(e)}"}
 
-@mcp.tool()
-def list_all_shapes_in_slide(presentation_id: str, slide_id: int) -> Dict[str, Any]:
+@com_tool
+@requires_presentation
+def list_all_shapes_in_slide(pres, presentation_id: str, slide_id: int, refresh: bool = True,
+                             offset: int = 0, limit: int = None) -> Dict[str, Any]:
     """
     List all shapes in a slide with detailed information to help identify which to update.
 
@@ -1112,12 +1682,23 @@ def list_all_shapes_in_slide(presentation_id: str, slide_id: int) -> Dict[str, A
     - Getting properties of shapes before repositioning
     - Understanding slide structure and what elements are present
 
+    The slide is read live by default. With refresh=False a cached listing is reused
+    while no tool has edited the slide and its SlideID and shape count are unchanged;
+    text or position edits made directly in PowerPoint are not detected.
+
+    Slides with many shapes (icon libraries) can be fetched in pages with offset and
+    limit; pass refresh=False for later pages to serve them from the cache.
+
     Args:
         presentation_id: ID of the presentation
         slide_id: ID of the slide (integer)
+        refresh: Read the slide live instead of reusing a cached listing (default: True)
+        offset: Number of shapes to skip when paging (default: 0)
+        limit: Maximum number of shapes to return (default: all)
 
     Returns:
-        Dictionary with slide_id, shape_count, and array of shapes with detailed info
+        Dictionary with slide_id, shape_count, and array of shapes with detailed info.
+        When paging, next_offset is included while more shapes remain.
 
     Example workflow:
         1. list_all_shapes_in_slide() to find icon with ID 5
@@ -1125,52 +1706,110 @@ def list_all_shapes_in_slide(presentation_id: str, slide_id: int) -> Dict[str, A
         3. list_all_shapes_in_slide() on target to get new icon's ID
         4. set_shape_position() to position the copied icon
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
-        # Get slide count
-        slide_count = pres.Slides.Count
-
-        # Validate slide_id
-        if slide_id < 1 or slide_id > slide_count:
-            return {"error": f"Invalid slide ID: {slide_id}. Valid range is 1-{slide_count}"}
-
-        slide = pres.Slides.Item(slide_id)
-        shapes = []
-
-        # Iterate through all shapes
-        for i in range(1, slide.Shapes.Count + 1):
-            shape = slide.Shapes.Item(i)
-
-            shape_info = {
-                "id": str(i),
-                "name": shape.Name if hasattr(shape, "Name") else "Unnamed",
-                "type": shape.Type,
-                "type_name": get_shape_type_name(shape.Type),
-                "has_text": is_text_box(shape)
-            }
-
-            # Extract text if available
-            if is_text_box(shape):
-                text = extract_shape_text(shape)
-                shape_info["text"] = text
+        result = stamp = None
+        if not refresh:
+            try:
+                slide = ppt_automation.get_slide(presentation_id, slide_id)
+                stamp = (slide.SlideID, slide.Shapes.Count)
+            except ID_LOOKUP_ERRORS:
+                # Invalid slide; read_slide_shape_list reports it
+                stamp = None
+            else:
+                result = ppt_automation.get_shape_list(presentation_id, slide_id, stamp)
+        if result is None:
+            result = read_slide_shape_list(pres, presentation_id, slide_id)
+            if "error" in result:
+                return result
+            if stamp is not None:
+                ppt_automation.cache_shape_list(presentation_id, slide_id, stamp, result)
+
+        if offset or limit is not None:
+            return page_shape_list(result, offset, limit)
+        return result
+    except Exception as e:
+        return {"error": f"Error listing shapes: {str(e)}"}
 
-            shapes.append(shape_info)
+def read_slide_shape_list(pres, presentation_id, slide_id):
+    """Helper function to build the full list_all_shapes_in_slide() result for a slide"""
+    # Get slide count
+    slide_count = pres.Slides.Count
+
+    # Validate slide_id
+    if slide_id < 1 or slide_id > slide_count:
+        return {"error": f"Invalid slide ID: {slide_id}. Valid range is 1-{slide_count}"}
+
+    slide = ppt_automation.get_slide(presentation_id, slide_id)
+
+    # One macro call returns every shape's metadata; fall back to walking them
+    dump = ppt_automation.run_macro("DumpShapes", slide)
+    if isinstance(dump, str):
+        shapes = parse_shape_dump(dump)
+    else:
+        shapes = read_shape_list(slide)
+
+    return {
+        "slide_id": slide_id,
+        "slide_index": slide_id,
+        "shape_count": len(shapes),
+        "shapes": shapes
+    }
 
-        return {
-            "slide_id": slide_id,
-            "slide_index": slide_id,
-            "shape_count": slide.Shapes.Count,
-            "shapes": shapes
+def page_shape_list(result, offset, limit):
+    """Helper function to cut one page out of a list_all_shapes_in_slide() result"""
+    offset = max(offset, 0)
+    end = len(result["shapes"]) if limit is None else offset + max(limit, 0)
+    page = dict(result, shapes=result["shapes"][offset:end])
+    if end < result["shape_count"]:
+        page["next_offset"] = end
+    return page
+
+def read_shape_list(slide):
+    """Helper function to build list_all_shapes_in_slide() entries by walking the slide's shapes"""
+    shapes = []
+
+    # Iterate through all shapes
+    for i, shape in enumerate(slide.Shapes, 1):
+        shape_type = shape.Type
+        text_info = inspect_shape_text(shape, shape_type)
+        shape_info = {
+            "id": str(i),
+            "name": getattr(shape, "Name", "Unnamed"),
+            "type": shape_type,
+            "type_name": get_shape_type_name(shape_type),
+            "has_text": text_info is not None
         }
-    except Exception as e:
-        return {"error": f"Error listing shapes: {str(e)}"}
 
-@mcp.tool()
-def save_copy(presentation_id: str, path: str) -> Dict[str, Any]:
+        # Extract text if available
+        if text_info is not None:
+            shape_info["text"] = text_info["text"]
+
+        shapes.append(shape_info)
+
+    return shapes
+
+def parse_shape_dump(dump):
+    """Helper function to turn a DumpShapes macro result into list_all_shapes_in_slide() entries"""
+    shapes = []
+    records = dump.split(MACRO_RECORD_SEP)[:-1]  # every record ends with a separator
+    for i, record in enumerate(records, 1):
+        name, shape_type, has_text_frame, text = record.split(MACRO_FIELD_SEP, 3)
+        shape_type = int(shape_type)
+        shape_info = {
+            "id": str(i),
+            "name": name,
+            "type": shape_type,
+            "type_name": get_shape_type_name(shape_type),
+            "has_text": shape_type == MSO_TEXT_BOX or has_text_frame == "1"
+        }
+        if shape_info["has_text"]:
+            shape_info["text"] = text
+        shapes.append(shape_info)
+    return shapes
+
+@com_tool
+@requires_presentation
+def save_copy(pres, presentation_id: str, path: str) -> Dict[str, Any]:
     """
     Create a copy of a presentation at the specified path.
 
@@ -1184,15 +1823,10 @@ def save_copy(presentation_id: str, path: str) -> Dict[str, Any]:
     Returns:
         Status of the operation and information about the saved copy
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
         # Get the directory path and create it if it doesn't exist
         save_dir = os.path.dirname(path)
-        if save_dir and not os.path.exists(save_dir):
+        if save_dir:
             os.makedirs(save_dir, exist_ok=True)
 
         # Use SaveCopyAs2 to create a copy without changing the active presentation
@@ -1208,8 +1842,23 @@ def save_copy(presentation_id: str, path: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Error saving copy: {str(e)}"}
 
-@mcp.tool()
-def get_presentation_sections(presentation_id: str) -> Dict[str, Any]:
+def build_section_info(index, name, section_id, first_slide, slide_count):
+    """Helper function to build one get_presentation_sections() entry"""
+    return {
+        "index": index,
+        "name": name,
+        "id": section_id,
+        # Slide range is inclusive on both ends
+        "slide_range": {
+            "start": first_slide,
+            "end": first_slide + slide_count - 1,
+            "count": slide_count
+        }
+    }
+
+@com_tool
+@requires_presentation
+def get_presentation_sections(pres, presentation_id: str) -> Dict[str, Any]:
     """
     Get all sections in a presentation with their slide ranges.
 
@@ -1242,20 +1891,32 @@ def get_presentation_sections(presentation_id: str) -> Dict[str, Any]:
         - Identify which section contains data visualization templates
         - Navigate to specific topics in large design system presentations
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
         sections = []
         total_slides = pres.Slides.Count
 
+        # One macro call returns the whole section table; fall back to reading it per section
+        dump = ppt_automation.run_macro("DumpSections", pres)
+        if isinstance(dump, str):
+            for i, record in enumerate(dump.split(MACRO_RECORD_SEP)[:-1], 1):
+                section_name, section_id, section_first_slide, section_slide_count = record.split(MACRO_FIELD_SEP)
+                sections.append(build_section_info(
+                    i, section_name, section_id, int(section_first_slide), int(section_slide_count)
+                ))
+            return {
+                "success": True,
+                "presentation_id": presentation_id,
+                "total_slides": total_slides,
+                "has_sections": len(sections) > 0,
+                "section_count": len(sections),
+                "sections": sections
+            }
+
         # Access sections using the correct API: pres.SectionProperties
         try:
             sect_props = pres.SectionProperties
             sections_count = sect_props.Count
-        except:
+        except COM_ERRORS:
             # If SectionProperties doesn't exist or is empty, return empty sections
             return {
                 "presentation_id": presentation_id,
@@ -1275,21 +1936,11 @@ def get_presentation_sections(presentation_id: str) -> Dict[str, Any]:
                 section_slide_count = sect_props.SlidesCount(i)
                 section_id = sect_props.SectionID(i)
 
-                # Calculate slide range (inclusive on both ends)
-                slide_range = {
-                    "start": section_first_slide,
-                    "end": section_first_slide + section_slide_count - 1,
-                    "count": section_slide_count
-                }
-
-                sections.append({
-                    "index": i,
-                    "name": section_name,
-                    "id": section_id,
-                    "slide_range": slide_range
-                })
-            except Exception as e:
-                # Log the error but continue with other sections
+                sections.append(build_section_info(
+                    i, section_name, section_id, section_first_slide, section_slide_count
+                ))
+            except COM_ERRORS:
+                # Skip a section that can't be read but continue with the others
                 continue
 
         return {
@@ -1303,8 +1954,42 @@ def get_presentation_sections(presentation_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Error getting presentation sections: {str(e)}"}
 
-@mcp.tool()
-def set_text_font_size(presentation_id: str, slide_id: str, shape_id: str, font_size: float) -> Dict[str, Any]:
+# Ways apply_shape_font() can reach a shape's text, in the order they are tried
+TEXT_APIS = ("TextFrame2", "TextFrame", "group")
+
+def apply_shape_font(shape, attribute, value, api=None):
+    """
+    Helper function to set one Font property (e.g. "Size" or "Name") on a shape's text.
+
+    Tries TextFrame2, then TextFrame, then the text of grouped shapes. Pass the api
+    that worked for this shape before to try it first. Returns the TEXT_APIS entry
+    that worked, or None if the shape has no editable text.
+    """
+    order = TEXT_APIS if api is None else (api,) + tuple(a for a in TEXT_APIS if a != api)
+    for candidate in order:
+        if candidate == "group":
+            # Try grouped shapes
+            if shape.Type == MSO_GROUP:
+                for subshape in shape.GroupItems:
+                    try:
+                        setattr(subshape.TextFrame.TextRange.Font, attribute, value)
+                        return candidate
+                    except COM_ERRORS:
+                        pass
+            continue
+
+        try:
+            setattr(getattr(shape, candidate).TextRange.Font, attribute, value)
+            return candidate
+        except COM_ERRORS:
+            pass
+
+    return None
+
+@com_tool
+@single_undo_entry
+@requires_presentation
+def set_text_font_size(pres, presentation_id: str, slide_id: str, shape_id: str, font_size: float) -> Dict[str, Any]:
     """
     Set the font size of text in a shape.
 
@@ -1327,25 +2012,9 @@ def set_text_font_size(presentation_id: str, slide_id: str, shape_id: str, font_
         - Adjust body text to 14pt for readability
         - Fix font sizes after copying slides from other presentations
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
-        # Parse IDs
-        if isinstance(slide_id, str):
-            clean_slide_id = slide_id.strip('"\'`')
-        else:
-            clean_slide_id = str(slide_id)
-
-        if isinstance(shape_id, str):
-            clean_shape_id = shape_id.strip('"\'`')
-        else:
-            clean_shape_id = str(shape_id)
-
-        slide_idx = int(clean_slide_id)
-        shape_idx = int(clean_shape_id)
+        slide_idx = parse_id(slide_id)
+        shape_idx = parse_id(shape_id)
     except ValueError as e:
         return {"error": f"Invalid ID format: {str(e)}"}
 
@@ -1353,43 +2022,35 @@ def set_text_font_size(presentation_id: str, slide_id: str, shape_id: str, font_
         return {"error": f"Invalid slide ID: {slide_id}"}
 
     try:
-        slide = pres.Slides.Item(slide_idx)
-    except Exception as e:
+        slide = ppt_automation.get_slide(presentation_id, slide_idx)
+    except COM_ERRORS as e:
         return {"error": f"Error accessing slide: {str(e)}"}
 
     if shape_idx < 1 or shape_idx > slide.Shapes.Count:
         return {"error": f"Invalid shape ID: {shape_id}"}
 
     try:
-        shape = slide.Shapes.Item(shape_idx)
-
-        # Try TextFrame2 first (newer PowerPoint versions)
-        if hasattr(shape, "TextFrame2"):
-            try:
-                shape.TextFrame2.TextRange.Font.Size = font_size
-                return {"success": True, "message": f"Font size set to {font_size} points"}
-            except:
-                pass
-
-        # Then try TextFrame
-        if hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "TextRange"):
-            shape.TextFrame.TextRange.Font.Size = font_size
+        shape = ppt_automation.get_shape(presentation_id, slide_idx, shape_idx)
+
+        api = apply_shape_font(
+            shape, "Size", font_size, ppt_automation.text_api(presentation_id, slide_idx, shape_idx)
+        )
+        if api is not None:
+            ppt_automation.remember_text_api(presentation_id, slide_idx, shape_idx, api)
+            ppt_automation.forget_slide_content(presentation_id, slide_idx)
+        if api == "group":
+            return {"success": True, "message": f"Font size set to {font_size} points in grouped shape"}
+        if api is not None:
             return {"success": True, "message": f"Font size set to {font_size} points"}
 
-        # Try grouped shapes
-        if shape.Type == 6:  # msoGroup
-            for i in range(1, shape.GroupItems.Count + 1):
-                subshape = shape.GroupItems.Item(i)
-                if hasattr(subshape, "TextFrame") and hasattr(subshape.TextFrame, "TextRange"):
-                    subshape.TextFrame.TextRange.Font.Size = font_size
-                    return {"success": True, "message": f"Font size set to {font_size} points in grouped shape"}
-
         return {"success": False, "message": "Shape does not contain editable text"}
     except Exception as e:
         return {"success": False, "error": f"Error setting font size: {str(e)}"}
 
-@mcp.tool()
-def set_text_font_name(presentation_id: str, slide_id: str, shape_id: str, font_name: str) -> Dict[str, Any]:
+@com_tool
+@single_undo_entry
+@requires_presentation
+def set_text_font_name(pres, presentation_id: str, slide_id: str, shape_id: str, font_name: str) -> Dict[str, Any]:
     """
     Set the font name/family of text in a shape.
 
@@ -1413,25 +2074,9 @@ def set_text_font_name(presentation_id: str, slide_id: str, shape_id: str, font_
         - Use "Akkurat Light" for body text
         - Fix fonts after importing slides from external presentations
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
-        # Parse IDs
-        if isinstance(slide_id, str):
-            clean_slide_id = slide_id.strip('"\'`')
-        else:
-            clean_slide_id = str(slide_id)
-
-        if isinstance(shape_id, str):
-            clean_shape_id = shape_id.strip('"\'`')
-        else:
-            clean_shape_id = str(shape_id)
-
-        slide_idx = int(clean_slide_id)
-        shape_idx = int(clean_shape_id)
+        slide_idx = parse_id(slide_id)
+        shape_idx = parse_id(shape_id)
     except ValueError as e:
         return {"error": f"Invalid ID format: {str(e)}"}
 
@@ -1439,43 +2084,34 @@ def set_text_font_name(presentation_id: str, slide_id: str, shape_id: str, font_
         return {"error": f"Invalid slide ID: {slide_id}"}
 
     try:
-        slide = pres.Slides.Item(slide_idx)
-    except Exception as e:
+        slide = ppt_automation.get_slide(presentation_id, slide_idx)
+    except COM_ERRORS as e:
         return {"error": f"Error accessing slide: {str(e)}"}
 
     if shape_idx < 1 or shape_idx > slide.Shapes.Count:
         return {"error": f"Invalid shape ID: {shape_id}"}
 
     try:
-        shape = slide.Shapes.Item(shape_idx)
-
-        # Try TextFrame2 first
-        if hasattr(shape, "TextFrame2"):
-            try:
-                shape.TextFrame2.TextRange.Font.Name = font_name
-                return {"success": True, "message": f"Font name set to {font_name}"}
-            except:
-                pass
-
-        # Then try TextFrame
-        if hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "TextRange"):
-            shape.TextFrame.TextRange.Font.Name = font_name
+        shape = ppt_automation.get_shape(presentation_id, slide_idx, shape_idx)
+
+        api = apply_shape_font(
+            shape, "Name", font_name, ppt_automation.text_api(presentation_id, slide_idx, shape_idx)
+        )
+        if api is not None:
+            ppt_automation.remember_text_api(presentation_id, slide_idx, shape_idx, api)
+            ppt_automation.forget_slide_content(presentation_id, slide_idx)
+        if api == "group":
+            return {"success": True, "message": f"Font name set to {font_name} in grouped shape"}
+        if api is not None:
             return {"success": True, "message": f"Font name set to {font_name}"}
 
-        # Try grouped shapes
-        if shape.Type == 6:  # msoGroup
-            for i in range(1, shape.GroupItems.Count + 1):
-                subshape = shape.GroupItems.Item(i)
-                if hasattr(subshape, "TextFrame") and hasattr(subshape.TextFrame, "TextRange"):
-                    subshape.TextFrame.TextRange.Font.Name = font_name
-                    return {"success": True, "message": f"Font name set to {font_name} in grouped shape"}
-
         return {"success": False, "message": "Shape does not contain editable text"}
     except Exception as e:
         return {"success": False, "error": f"Error setting font name: {str(e)}"}
 
-@mcp.tool()
-def get_shape_properties(presentation_id: str, slide_id: int, shape_id: int) -> Dict[str, Any]:
+@com_tool
+@requires_presentation
+def get_shape_properties(pres, presentation_id: str, slide_id: int, shape_id: int) -> Dict[str, Any]:
     """
     Get detailed properties of a shape including position, size, and formatting.
 
@@ -1506,28 +2142,24 @@ def get_shape_properties(presentation_id: str, slide_id: int, shape_id: int) ->
         - Get dimensions for precise shape alignment
         - Identify shape type to determine what operations are valid
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
         slide_count = pres.Slides.Count
         if slide_id < 1 or slide_id > slide_count:
             return {"error": f"Invalid slide ID: {slide_id}"}
 
-        slide = pres.Slides.Item(slide_id)
+        slide = ppt_automation.get_slide(presentation_id, slide_id)
 
         if shape_id < 1 or shape_id > slide.Shapes.Count:
             return {"error": f"Invalid shape ID: {shape_id}"}
 
-        shape = slide.Shapes.Item(shape_id)
+        shape = ppt_automation.get_shape(presentation_id, slide_id, shape_id)
 
+        shape_type = shape.Type
         properties = {
             "id": str(shape_id),
-            "name": shape.Name if hasattr(shape, "Name") else "Unnamed",
-            "type": shape.Type,
-            "type_name": get_shape_type_name(shape.Type),
+            "name": getattr(shape, "Name", "Unnamed"),
+            "type": shape_type,
+            "type_name": get_shape_type_name(shape_type),
             "position": {
                 "left": shape.Left,
                 "top": shape.Top,
@@ -1536,29 +2168,13 @@ def get_shape_properties(presentation_id: str, slide_id: int, shape_id: int) ->
             }
         }
 
-        # Add text properties if available
-        if is_text_box(shape):
+        # Add text and font properties if available
+        text_info = inspect_shape_text(shape, shape_type, with_font=True)
+        if text_info is not None:
             properties["has_text"] = True
-            properties["text"] = extract_shape_text(shape)
-
-            # Try to get font properties
-            try:
-                if hasattr(shape, "TextFrame2"):
-                    font = shape.TextFrame2.TextRange.Font
-                    properties["font"] = {
-                        "name": font.Name if hasattr(font, "Name") else None,
-                        "size": font.Size if hasattr(font, "Size") else None,
-                        "bold": font.Bold if hasattr(font, "Bold") else None
-                    }
-                elif hasattr(shape, "TextFrame") and hasattr(shape.TextFrame, "TextRange"):
-                    font = shape.TextFrame.TextRange.Font
-                    properties["font"] = {
-                        "name": font.Name if hasattr(font, "Name") else None,
-                        "size": font.Size if hasattr(font, "Size") else None,
-                        "bold": font.Bold if hasattr(font, "Bold") else None
-                    }
-            except:
-                pass
+            properties["text"] = text_info["text"]
+            if text_info["font"] is not None:
+                properties["font"] = text_info["font"]
         else:
             properties["has_text"] = False
 
@@ -1569,8 +2185,10 @@ def get_shape_properties(presentation_id: str, slide_id: int, shape_id: int) ->
     except Exception as e:
         return {"error": f"Error getting shape properties: {str(e)}"}
 
-@mcp.tool()
-def set_shape_position(presentation_id: str, slide_id: int, shape_id: int,
+@com_tool
+@single_undo_entry
+@requires_presentation
+def set_shape_position(pres, presentation_id: str, slide_id: int, shape_id: int,
                        left: float = None, top: float = None,
                        width: float = None, height: float = None) -> Dict[str, Any]:
     """
@@ -1599,48 +2217,154 @@ def set_shape_position(presentation_id: str, slide_id: int, shape_id: int,
         - Resize without moving: set_shape_position(..., width=300, height=200)
         - Fine-tune positioning after copying shapes from library slides
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
-        slide_count = pres.Slides.Count
-        if slide_id < 1 or slide_id > slide_count:
+        # Slides.Item / Shapes.Item reject out-of-range IDs themselves, so no Count is read
+        try:
+            ppt_automation.get_slide(presentation_id, slide_id)
+        except ID_LOOKUP_ERRORS:
             return {"error": f"Invalid slide ID: {slide_id}"}
-
-        slide = pres.Slides.Item(slide_id)
-
-        if shape_id < 1 or shape_id > slide.Shapes.Count:
+        try:
+            shape = ppt_automation.get_shape(presentation_id, slide_id, shape_id)
+        except ID_LOOKUP_ERRORS:
             return {"error": f"Invalid shape ID: {shape_id}"}
 
-        shape = slide.Shapes.Item(shape_id)
-
-        # Update properties that were provided
-        if left is not None:
-            shape.Left = left
-        if top is not None:
-            shape.Top = top
-        if width is not None:
-            shape.Width = width
-        if height is not None:
-            shape.Height = height
+        new_left, new_top, new_width, new_height = apply_shape_geometry(shape, left, top, width, height)
+        ppt_automation.forget_slide_content(presentation_id, slide_id)
 
         return {
             "success": True,
             "message": "Shape position/size updated",
             "new_position": {
-                "left": shape.Left,
-                "top": shape.Top,
-                "width": shape.Width,
-                "height": shape.Height
+                "left": new_left,
+                "top": new_top,
+                "width": new_width,
+                "height": new_height
             }
         }
     except Exception as e:
         return {"error": f"Error setting shape position: {str(e)}"}
+    finally:
+        collect_com_garbage()
+
+@com_tool
+@single_undo_entry
+@requires_presentation
+def set_shape_positions(pres, presentation_id: str, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Set the position and/or size of several shapes in one call.
+
+    Applies the same rules as set_shape_position() to every update, but makes all
+    writes a single undo step. Prefer this over repeated set_shape_position() calls
+    when aligning or laying out several shapes.
 
-@mcp.tool()
-def copy_shape(presentation_id: str, source_slide_id: int, source_shape_id: int,
+    Args:
+        presentation_id: ID of the presentation
+        updates: List of updates, each {"slide_id": ..., "shape_id": ..., and any of
+            "left", "top", "width", "height"} where slide_id and shape_id are integers
+            or numeric strings and omitted values are left unchanged
+
+    Returns:
+        Dictionary with an overall success flag, the number of shapes updated, and a
+        "results" list holding the status and new position of each update in the same
+        order as `updates`
+
+    Example workflow:
+        1. list_all_shapes_in_slide() to find the shapes to align
+        2. set_shape_positions() with e.g. the same "top" for every shape in a row
+    """
+    results = [None] * len(updates)
+
+    # Parse IDs up front and group the updates by slide
+    updates_by_slide = {}
+    for pos, update in enumerate(updates):
+        try:
+            slide_idx = parse_id(update["slide_id"])
+            shape_idx = parse_id(update["shape_id"])
+        except ValueError as e:
+            results[pos] = {"error": f"Invalid ID format: {str(e)}"}
+            continue
+        except (KeyError, TypeError) as e:
+            results[pos] = {"error": f"Invalid update: {str(e)}"}
+            continue
+        updates_by_slide.setdefault(slide_idx, []).append((pos, shape_idx, update))
+
+    try:
+        for slide_idx in sorted(updates_by_slide):
+            slide_updates = updates_by_slide[slide_idx]
+
+            # Resolve each slide's Shapes collection once for all of its updates
+            try:
+                if slide_idx < 1:
+                    raise IndexError(slide_idx)
+                shapes = ppt_automation.get_slide(presentation_id, slide_idx).Shapes
+            except ID_LOOKUP_ERRORS:
+                for pos, _, update in slide_updates:
+                    results[pos] = {"error": f"Invalid slide ID: {update['slide_id']}"}
+                continue
+
+            for pos, shape_idx, update in slide_updates:
+                try:
+                    shape = shapes.Item(shape_idx)
+                except ID_LOOKUP_ERRORS:
+                    results[pos] = {"error": f"Invalid shape ID: {update['shape_id']}"}
+                    continue
+
+                try:
+                    new_left, new_top, new_width, new_height = apply_shape_geometry(
+                        shape, update.get("left"), update.get("top"), update.get("width"), update.get("height")
+                    )
+                    ppt_automation.forget_slide_content(presentation_id, slide_idx)
+                    results[pos] = {
+                        "success": True,
+                        "new_position": {
+                            "left": new_left,
+                            "top": new_top,
+                            "width": new_width,
+                            "height": new_height
+                        }
+                    }
+                except Exception as e:
+                    results[pos] = {"success": False, "error": f"Error setting shape position: {str(e)}"}
+    finally:
+        collect_com_garbage()
+
+    updated = sum(1 for r in results if r.get("success"))
+    return {
+        "success": updated == len(updates),
+        "updated": updated,
+        "results": results
+    }
+
+def apply_shape_geometry(shape, left=None, top=None, width=None, height=None):
+    """
+    Helper function to set the given geometry values of a shape (None = keep) and
+    return the resulting (left, top, width, height).
+
+    Uses the SetPos macro so the writes and the read-back cost one COM call; falls
+    back to per-property access when macros are unavailable.
+    """
+    mask = sum(bit for bit, value in ((1, left), (2, top), (4, width), (8, height)) if value is not None)
+    geometry = ppt_automation.run_macro(
+        "SetPos", shape, left or 0, top or 0, width or 0, height or 0, mask
+    )
+    if isinstance(geometry, str):
+        return tuple(map(float, geometry.split(MACRO_FIELD_SEP)))
+
+    # Update properties that were provided
+    if left is not None:
+        shape.Left = left
+    if top is not None:
+        shape.Top = top
+    if width is not None:
+        shape.Width = width
+    if height is not None:
+        shape.Height = height
+    return shape.Left, shape.Top, shape.Width, shape.Height
+
+@com_tool
+@single_undo_entry
+@requires_presentation
+def copy_shape(pres, presentation_id: str, source_slide_id: int, source_shape_id: int,
                target_slide_id: int, left: float = None, top: float = None) -> Dict[str, Any]:
     """
     Copy a shape from one slide to another, optionally setting its position.
@@ -1654,8 +2378,9 @@ def copy_shape(presentation_id: str, source_slide_id: int, source_shape_id: int,
     - Charts, tables, and more
 
     In PowerPoint's COM API, everything visual is a "shape" - images, icons, text boxes,
-    graphics, etc. This function uses Shape.Copy() and Shapes.Paste() which work
-    universally across all shape types, preserving all formatting, images, and properties.
+    graphics, etc. Within one slide this function uses Shape.Duplicate(); across slides it
+    uses Shape.Copy() and Shapes.Paste(). Both work universally across all shape types,
+    preserving all formatting, images, and properties.
 
     Use this to copy icons from library slides, duplicate branded graphics, or reuse
     visual elements across slides with precise positioning control.
@@ -1677,62 +2402,62 @@ def copy_shape(presentation_id: str, source_slide_id: int, source_shape_id: int,
         - Copy grouped graphics with all elements intact
         - Reuse complex visual elements with consistent positioning
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
-        slide_count = pres.Slides.Count
-
-        # Validate source slide
-        if source_slide_id < 1 or source_slide_id > slide_count:
+        # Slides.Item / Shapes.Item reject out-of-range IDs themselves, so no Count is read
+        try:
+            ppt_automation.get_slide(presentation_id, source_slide_id)
+        except ID_LOOKUP_ERRORS:
             return {"error": f"Invalid source slide ID: {source_slide_id}"}
-
-        # Validate target slide
-        if target_slide_id < 1 or target_slide_id > slide_count:
+        try:
+            target_slide = ppt_automation.get_slide(presentation_id, target_slide_id)
+        except ID_LOOKUP_ERRORS:
             return {"error": f"Invalid target slide ID: {target_slide_id}"}
-
-        source_slide = pres.Slides.Item(source_slide_id)
-        target_slide = pres.Slides.Item(target_slide_id)
-
-        # Validate shape
-        if source_shape_id < 1 or source_shape_id > source_slide.Shapes.Count:
+        try:
+            source_shape = ppt_automation.get_shape(presentation_id, source_slide_id, source_shape_id)
+        except ID_LOOKUP_ERRORS:
             return {"error": f"Invalid shape ID: {source_shape_id}"}
 
-        source_shape = source_slide.Shapes.Item(source_shape_id)
-
-        # Duplicate the shape by using copy/paste
-        source_shape.Copy()
-        target_slide.Shapes.Paste()
+        if source_slide_id == target_slide_id:
+            # Same slide: Duplicate() stays inside PowerPoint and leaves the
+            # user's clipboard alone
+            new_range = source_shape.Duplicate()
+        else:
+            # Cross-slide copies still need the clipboard; every tool call runs
+            # on the single COM thread, so Copy and Paste cannot interleave
+            source_shape.Copy()
+            new_range = target_slide.Shapes.Paste()
+        ppt_automation.invalidate(presentation_id)
 
-        # The pasted shape is now the last shape on the target slide
-        new_shape_id = target_slide.Shapes.Count
-        new_shape = target_slide.Shapes.Item(new_shape_id)
+        # Both calls return a ShapeRange holding just the new shape
+        new_shape = new_range.Item(1)
+        new_shape_id = new_shape.ZOrderPosition
 
         # Set position if specified
-        if left is not None:
-            new_shape.Left = left
-        if top is not None:
-            new_shape.Top = top
+        new_left, new_top, new_width, new_height = apply_shape_geometry(new_shape, left, top)
 
         return {
             "success": True,
             "new_shape_id": str(new_shape_id),
-            "new_shape_name": new_shape.Name if hasattr(new_shape, "Name") else "Unnamed",
+            "new_shape_name": getattr(new_shape, "Name", "Unnamed"),
             "position": {
-                "left": new_shape.Left,
-                "top": new_shape.Top,
-                "width": new_shape.Width,
-                "height": new_shape.Height
+                "left": new_left,
+                "top": new_top,
+                "width": new_width,
+                "height": new_height
             },
             "message": f"Shape copied from slide {source_slide_id} to slide {target_slide_id}"
         }
     except Exception as e:
         return {"error": f"Error copying shape: {str(e)}"}
-
-@mcp.tool()
-def export_slide_as_image(presentation_id: str, slide_id: int, image_format: str = "PNG", width: int = None, height: int = None) -> Dict[str, Any]:
+    finally:
+        collect_com_garbage()
+
+@com_tool
+@requires_presentation
+def export_slide_as_image(pres, presentation_id: str, slide_id: int, image_format: str = "JPG", width: int = None, height: int = None,
+                          async_export: bool = False, inline_bytes: bool = False,
+                          overwrite_path: str = None, strict_size: bool = False,
+                          refresh: bool = True) -> Dict[str, Any]:
     """
     Export a slide as an image file to verify formatting and content.
 
@@ -1745,20 +2470,46 @@ def export_slide_as_image(presentation_id: str, slide_id: int, image_format: str
     - Text fits within boundaries and doesn't overflow
     - Overall slide appearance before finalizing
 
-    Exports to temporary directory with timestamped filename to prevent version confusion.
-    Each export gets a unique timestamp (YYYYMMDD_HHMMSS) so you can compare multiple
-    versions if needed.
+    Exports to temporary directory with a unique filename to prevent version confusion.
+    Each export is tagged with the server start time (YYYYMMDD_HHMMSS), the server's
+    process ID and a running number, so you can compare multiple versions if needed.
+    Set the TMPDIR_RAM environment variable to export to another directory (e.g. a RAM disk).
 
     IMPORTANT: Automatically maintains the slide's aspect ratio (16:9, 4:3, or custom).
     If you specify only width, height is calculated to maintain ratio. If you specify
-    neither, defaults to 1920px wide (HD resolution) with correct aspect ratio.
+    neither, defaults to 1920px wide (HD resolution) with correct aspect ratio. A width
+    you pass is used exactly; if you specify only height, the calculated width is
+    rounded up to a multiple of 16 unless strict_size=True.
+
+    With async_export=True the render is queued behind the current call and the path is
+    returned straight away; call get_export_status(path) before opening the file.
+
+    The slide is rendered on every call by default. With refresh=False, if the slide's
+    shapes, positions, sizes and text are unchanged since it was last exported that way
+    with the same format and size, that file is returned again with "cached": true.
+    This also covers edits made directly in the PowerPoint UI, except pure formatting
+    changes (colors, fonts) made there, so only pass refresh=False when those can't
+    have happened.
+
+    With inline_bytes=True the image is returned base64-encoded in "image_b64" (async_export
+    is ignored). A temp file created by the call is deleted and "path" is None; a cached
+    export or the overwrite_path file is kept.
+
+    Pass overwrite_path to always render to the same file (e.g. the path of an earlier
+    export) instead of creating a new file per version. Such files are never returned
+    as cached exports of later calls.
 
     Args:
         presentation_id: ID of the presentation
         slide_id: ID of the slide to export (integer)
-        image_format: Image format - "PNG" or "JPG" (default: PNG)
+        image_format: Image format - "PNG" or "JPG" (default: JPG, PNG for lossless output)
         width: Width of exported image in pixels (optional, default: 1920 for HD)
         height: Height of exported image in pixels (optional, auto-calculated from width)
+        async_export: Return before the slide is rendered (default: False)
+        inline_bytes: Return the image bytes instead of leaving a file behind (default: False)
+        overwrite_path: File to export to, replacing it if it exists (optional, default: new temp file)
+        strict_size: Keep a width calculated from height exact instead of rounding it up to a multiple of 16 (default: False)
+        refresh: Always render the slide instead of reusing an unchanged earlier export (default: True)
 
     Returns:
         Dictionary with path to exported image file in temp directory
@@ -1769,69 +2520,57 @@ def export_slide_as_image(presentation_id: str, slide_id: int, image_format: str
         - After copying icons: verify positioning matches design
         - Before finalizing presentation: visual QA check
     """
-    if presentation_id not in ppt_automation.presentations:
-        return {"error": "Presentation ID not found"}
-
-    pres = ppt_automation.presentations[presentation_id]
-
     try:
-        # Get slide count
-        slide_count = pres.Slides.Count
-
-        # Validate slide_id
-        if slide_id < 1 or slide_id > slide_count:
-            return {"error": f"Invalid slide ID: {slide_id}. Valid range is 1-{slide_count}"}
-
-        # Validate image format
-        if image_format.upper() not in ["PNG", "JPG", "JPEG"]:
+        # Validate image format first; it needs no COM call
+        export_format = EXPORT_FORMATS.get(image_format.upper())
+        if export_format is None:
             return {"error": f"Invalid image format: {image_format}. Supported formats: PNG, JPG"}
+        filter_name, file_ext = export_format
 
-        # Get the presentation's slide dimensions to maintain aspect ratio
-        slide_width_points = pres.PageSetup.SlideWidth
-        slide_height_points = pres.PageSetup.SlideHeight
-        aspect_ratio = slide_width_points / slide_height_points
-
-        # Calculate export dimensions maintaining aspect ratio
-        if width is None and height is None:
-            # Default to HD resolution (1920px wide)
-            export_width = 1920
-            export_height = int(export_width / aspect_ratio)
-        elif width is not None and height is None:
-            # Width specified, calculate height
-            export_width = width
-            export_height = int(export_width / aspect_ratio)
-        elif width is None and height is not None:
-            # Height specified, calculate width
-            export_height = height
-            export_width = int(export_height * aspect_ratio)
-        else:
-            # Both specified - use as-is (may distort if ratio doesn't match)
-            export_width = width
-            export_height = height
-
-        # Get the slide
-        slide = pres.Slides.Item(slide_id)
-
-        # Create temporary file path for the image with timestamp
-        import tempfile
-        from datetime import datetime
-        temp_dir = tempfile.gettempdir()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_ext = image_format.lower() if image_format.upper() != 'JPEG' else 'jpg'
-        image_filename = f"slide_{slide_id}_{timestamp}_{file_ext}.{file_ext}"
-        export_path = os.path.join(temp_dir, image_filename)
-
-        # Export the slide as an image
-        # Note: FilterName must be uppercase for PowerPoint COM API
-        filter_name = image_format.upper()
-        if filter_name == "JPEG":
-            filter_name = "JPG"
-
-        slide.Export(export_path, filter_name, export_width, export_height)
+        # Validate slide_id; Slides.Count is only read for the error message
+        try:
+            if slide_id < 1:
+                raise IndexError(slide_id)
+            slide = ppt_automation.get_slide(presentation_id, slide_id)
+        except ID_LOOKUP_ERRORS:
+            return {"error": f"Invalid slide ID: {slide_id}. Valid range is 1-{pres.Slides.Count}"}
 
-        return {
+        # Get the presentation's slide dimensions to maintain aspect ratio
+        slide_width_points, slide_height_points, aspect_ratio = slide_size(pres)
+        export_width, export_height = export_dimensions(aspect_ratio, width, height, strict_size)
+
+        # Reuse the last export if asked to and the slide hasn't changed since
+        fingerprint = image_path = None
+        if not refresh:
+            fingerprint = slide_fingerprint(slide)
+            image_path = ppt_automation.cached_export(
+                presentation_id, slide_id, filter_name, export_width, export_height, fingerprint
+            )
+        cached = image_path is not None and overwrite_path in (None, image_path)
+        if cached or inline_bytes:
+            async_export = False
+        if not cached:
+            image_path = overwrite_path or export_path(slide_id, file_ext)
+            # The file is about to hold this slide, so no cached export may point at it any more
+            ppt_automation.forget_export_path(image_path)
+
+            if async_export:
+                # Runs on the COM thread once this call returns, ahead of any later tool call
+                future = com_apartment.submit(slide.Export, image_path, filter_name, export_width, export_height)
+                track_export(image_path, future)
+            else:
+                slide.Export(image_path, filter_name, export_width, export_height)
+            # Only new temp files are reused; the caller may replace an overwrite_path file
+            if fingerprint is not None and not inline_bytes and overwrite_path is None:
+                ppt_automation.remember_export(
+                    presentation_id, slide_id, filter_name, export_width, export_height, fingerprint, image_path
+                )
+
+        result = {
             "success": True,
-            "path": export_path,
+            "pending": async_export,
+            "cached": cached,
+            "path": image_path,
             "slide_id": slide_id,
             "image_format": image_format.upper(),
             "dimensions": {
@@ -1840,10 +2579,179 @@ def export_slide_as_image(presentation_id: str, slide_id: int, image_format: str
                 "aspect_ratio": round(aspect_ratio, 2),
                 "slide_size": f"{slide_width_points:.0f}x{slide_height_points:.0f} points"
             },
-            "message": f"Slide {slide_id} exported successfully to {export_path} at {export_width}x{export_height}px"
+            "message": (f"Slide {slide_id} export to {image_path} queued" if async_export
+                        else f"Slide {slide_id} unchanged since its export to {image_path}" if cached
+                        else f"Slide {slide_id} exported successfully to {image_path}")
+                       + f" at {export_width}x{export_height}px"
         }
+        if inline_bytes:
+            with open(image_path, "rb") as image_file:
+                result["image_b64"] = base64.b64encode(image_file.read()).decode("ascii")
+            # Only remove the temp file this call created, never a cached export or overwrite_path
+            if not cached and overwrite_path is None:
+                ppt_automation.forget_export_path(image_path)
+                os.remove(image_path)
+                result["path"] = None
+        return result
+    except Exception as e:
+        return {"error": f"Error exporting slide: {str(e)}"}
+
+def slide_fingerprint(slide):
+    """
+    Helper function returning a summary of a slide's content for the export cache.
+
+    Covers the slide's SlideID and each shape's Id, position, size and text, so it
+    changes after edits made by tools or in the PowerPoint UI. Uses one SlideSignature
+    macro call when the helper macros are available, otherwise walks the shapes.
+    """
+    signature = ppt_automation.run_macro("SlideSignature", slide)
+    if isinstance(signature, str):
+        return signature
+    shapes = []
+    for shape in slide.Shapes:
+        text_info = inspect_shape_text(shape)
+        shapes.append((
+            shape.Id, shape.Left, shape.Top, shape.Width, shape.Height,
+            text_info["text"] if text_info is not None else ""
+        ))
+    return (slide.SlideID, tuple(shapes))
+
+def slide_size(pres):
+    """
+    Helper function to read (slide_width, slide_height, aspect_ratio) in points.
+
+    Read on every export, since the slide size can be changed in PowerPoint at any time.
+    """
+    page_setup = pres.PageSetup
+    width, height = page_setup.SlideWidth, page_setup.SlideHeight
+    return width, height, width / height
+
+def export_dimensions(aspect_ratio, width=None, height=None, strict_size=False):
+    """
+    Helper function to work out the (width, height) in pixels of a slide export.
+
+    Requested sizes are used exactly. A width derived from the height is rounded up
+    to a multiple of 16 (aligned bitmap rows render faster) unless strict_size is set.
+    """
+    if width is None and height is None:
+        # Default to HD resolution (1920px wide)
+        width = 1920
+    if height is None:
+        # Width specified, calculate height
+        return width, int(width / aspect_ratio)
+    if width is None:
+        # Height specified, calculate width
+        width = int(height * aspect_ratio)
+        if not strict_size:
+            width = (width + 15) & ~15
+        return width, height
+    # Both specified - use as-is (may distort if ratio doesn't match)
+    return width, height
+
+def export_path(slide_id, file_ext):
+    """Helper function returning a new, unique temp-directory path for a slide export"""
+    image_filename = f"slide_{slide_id}_{EXPORT_RUN_TAG}_{next(export_counter):06d}.{file_ext}"
+    # TMPDIR_RAM may point at a RAM disk to keep exports off the physical disk
+    return os.path.join(os.environ.get("TMPDIR_RAM") or tempfile.gettempdir(), image_filename)
+
+@com_tool
+def get_export_status(path: str) -> Dict[str, Any]:
+    """
+    Check the result of an export started with export_slide_as_image(async_export=True).
+
+    Tool calls run in order on the COM thread, so by the time this runs the queued
+    export has finished and the file at path is complete.
+
+    Args:
+        path: Path returned by export_slide_as_image
+    """
+    future = pending_exports.pop(path, None)
+    if future is None:
+        return {"error": f"No pending export for path: {path}. Its status was already "
+                         "reported, or it finished long ago and was dropped"}
+    try:
+        future.result()
     except Exception as e:
         return {"error": f"Error exporting slide: {str(e)}"}
+    return {"success": True, "path": path, "message": f"Export to {path} finished"}
+
+@com_tool
+@requires_presentation
+def export_slides_as_images(pres, presentation_id: str, slide_ids: List[int], image_format: str = "JPG",
+                            width: int = None, height: int = None, strict_size: bool = False,
+                            refresh: bool = True) -> Dict[str, Any]:
+    """
+    Export several slides as image files in one call.
+
+    Same output as calling export_slide_as_image() once per slide, but the slide size,
+    export dimensions and format are worked out once for the whole batch.
+    With refresh=False, slides that are unchanged since their last export are not
+    rendered again (see export_slide_as_image for what counts as unchanged).
+    Use this for a visual QA pass over a whole deck or a range of new slides.
+
+    Args:
+        presentation_id: ID of the presentation
+        slide_ids: IDs of the slides to export (integers or numeric strings)
+        image_format: Image format - "PNG" or "JPG" (default: JPG, PNG for lossless output)
+        width: Width of exported images in pixels (optional, default: 1920 for HD)
+        height: Height of exported images in pixels (optional, auto-calculated from width)
+        strict_size: Keep a width calculated from height exact instead of rounding it up to a multiple of 16 (default: False)
+        refresh: Always render the slides instead of reusing unchanged earlier exports (default: True)
+
+    Returns:
+        Dictionary with an overall success flag, the export dimensions, and an "exports"
+        list holding {"slide_id", "path"} or an error for each requested slide
+    """
+    try:
+        export_format = EXPORT_FORMATS.get(image_format.upper())
+        if export_format is None:
+            return {"error": f"Invalid image format: {image_format}. Supported formats: PNG, JPG"}
+        filter_name, file_ext = export_format
+
+        slide_count = pres.Slides.Count
+        _, _, aspect_ratio = slide_size(pres)
+        export_width, export_height = export_dimensions(aspect_ratio, width, height, strict_size)
+
+        exports = []
+        for slide_id in slide_ids:
+            try:
+                slide_id = parse_id(slide_id)
+            except ValueError as e:
+                exports.append({"slide_id": slide_id, "error": f"Invalid slide ID format: {str(e)}"})
+                continue
+            if slide_id < 1 or slide_id > slide_count:
+                exports.append({"slide_id": slide_id, "error": f"Invalid slide ID: {slide_id}. Valid range is 1-{slide_count}"})
+                continue
+            try:
+                slide = ppt_automation.get_slide(presentation_id, slide_id)
+                if not refresh:
+                    fingerprint = slide_fingerprint(slide)
+                    image_path = ppt_automation.cached_export(
+                        presentation_id, slide_id, filter_name, export_width, export_height, fingerprint
+                    )
+                    if image_path is not None:
+                        exports.append({"slide_id": slide_id, "path": image_path, "cached": True})
+                        continue
+                image_path = export_path(slide_id, file_ext)
+                slide.Export(image_path, filter_name, export_width, export_height)
+                if not refresh:
+                    ppt_automation.remember_export(
+                        presentation_id, slide_id, filter_name, export_width, export_height, fingerprint, image_path
+                    )
+                exports.append({"slide_id": slide_id, "path": image_path})
+            except Exception as e:
+                exports.append({"slide_id": slide_id, "error": f"Error exporting slide: {str(e)}"})
+
+        exported = sum(1 for entry in exports if "path" in entry)
+        return {
+            "success": exported == len(slide_ids),
+            "exported": exported,
+            "image_format": image_format.upper(),
+            "dimensions": {"width": export_width, "height": export_height},
+            "exports": exports
+        }
+    except Exception as e:
+        return {"error": f"Error exporting slides: {str(e)}"}
 
 def main():
     mcp.run(transport="stdio")
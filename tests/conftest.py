@@ -7,14 +7,14 @@ import pytest
 
 @pytest.fixture(autouse=True)
 def reset_ppt_automation():
-    """Reset the ppt_automation presentations before each test."""
-    from main import ppt_automation
+    """Give every test a fresh ppt_automation state and no queued exports."""
+    from main import ppt_automation, pending_exports
 
-    # Store original presentations
-    original_presentations = ppt_automation.presentations.copy()
+    # Re-running __init__ resets ppt_app, the registry, every cache and the macro host fields
+    ppt_automation.__init__()
+    pending_exports.clear()
 
     yield
 
-    # Restore original state (clean up test presentations)
-    ppt_automation.presentations.clear()
-    ppt_automation.presentations.update(original_presentations)
+    ppt_automation.__init__()
+    pending_exports.clear()
@@ -14,13 +14,29 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from main import (
+    copy_shape,
     copy_slide,
     delete_slide,
+    export_dimensions,
+    export_slide_as_image,
+    export_slides_as_images,
+    get_export_status,
+    pending_exports,
+    track_export,
     move_slide,
     get_presentation_info,
+    get_slides,
+    get_slide_text,
     list_all_shapes_in_slide,
     save_copy,
+    set_shape_position,
+    set_shape_positions,
+    slide_size,
+    update_text,
+    update_texts,
     ppt_automation,
+    com_apartment,
+    close_macro_host_at_exit,
 )
 
 
@@ -46,10 +62,12 @@ def mock_presentation():
         shape1 = MagicMock()
         shape1.Name = "Title"
         shape1.Type = 14  # Placeholder
+        shape1.ZOrderPosition = 1
         shape1.TextFrame = MagicMock()
         shape1.TextFrame.TextRange = MagicMock()
         shape1.TextFrame.TextRange.Text = "Slide Title"
         shapes.Item = MagicMock(return_value=shape1)
+        shapes.__iter__.side_effect = lambda shape=shape1: iter([shape, shape])
         slide.Shapes = shapes
 
     pres.Slides = slides
@@ -139,6 +157,9 @@ def test_move_slide_success(setup_ppt_automation):
 
     assert result["success"] is True
     assert "moved to position" in result["message"]
+    slide = ppt_automation.presentations[pres_id].Slides.Item(1)
+    slide.MoveTo.assert_called_once_with(3)
+    slide.Copy.assert_not_called()
 
 
 def test_move_slide_invalid_presentation():
@@ -202,6 +223,91 @@ def test_list_all_shapes_in_slide_success(setup_ppt_automation):
     assert len(result["shapes"]) > 0
 
 
+def test_list_all_shapes_in_slide_uses_macro_dump(setup_ppt_automation):
+    """Test that a DumpShapes macro result is parsed instead of walking the shapes."""
+    pres_id = setup_ppt_automation
+    dump = "Title\x1f14\x1f1\x1fHello\x1eLogo\x1f13\x1f0\x1f\x1e"
+
+    with patch.object(ppt_automation, "run_macro", return_value=dump):
+        result = list_all_shapes_in_slide(pres_id, 1)
+
+    assert result["shape_count"] == 2
+    assert result["shapes"][0] == {
+        "id": "1", "name": "Title", "type": 14, "type_name": "msoPlaceholder",
+        "has_text": True, "text": "Hello"
+    }
+    assert result["shapes"][1]["has_text"] is False
+    assert "text" not in result["shapes"][1]
+
+
+def test_get_slide_text_uses_macro_dump(setup_ppt_automation):
+    """Test that get_slide_text reads the slide live with DumpShapes, ignoring cached listings."""
+    pres_id = setup_ppt_automation
+    dump = "Title\x1f14\x1f1\x1fHello\x1eLogo\x1f13\x1f0\x1f\x1eBody\x1f17\x1f0\x1f\x1e"
+    list_all_shapes_in_slide(pres_id, 1)
+
+    with patch.object(ppt_automation, "run_macro", return_value=dump):
+        result = get_slide_text(pres_id, 1)
+
+    assert result["shape_count"] == 3
+    assert result["content"] == {"1": {"shape_name": "Title", "text": "Hello"}}
+
+
+def test_list_all_shapes_in_slide_cached_until_edit(setup_ppt_automation, mock_presentation):
+    """Test that refresh=False reuses a listing until a mutating tool runs."""
+    pres_id = setup_ppt_automation
+    shapes = mock_presentation.Slides.Item(1).Shapes
+
+    first = list_all_shapes_in_slide(pres_id, 1, refresh=False)
+    second = list_all_shapes_in_slide(pres_id, 1, refresh=False)
+    assert second is first
+    assert shapes.__iter__.call_count == 1
+
+    list_all_shapes_in_slide(pres_id, 1)
+    assert shapes.__iter__.call_count == 2
+
+    set_shape_position(pres_id, 1, 1, left=10)
+    list_all_shapes_in_slide(pres_id, 1, refresh=False)
+    assert shapes.__iter__.call_count == 3
+
+
+def test_list_all_shapes_in_slide_cache_detects_ui_changes(setup_ppt_automation, mock_presentation):
+    """Test that a shape added outside the tools invalidates the cached listing."""
+    pres_id = setup_ppt_automation
+    shapes = mock_presentation.Slides.Item(1).Shapes
+
+    first = list_all_shapes_in_slide(pres_id, 1, refresh=False)
+    shapes.Count = 3
+    second = list_all_shapes_in_slide(pres_id, 1, refresh=False)
+
+    assert second is not first
+    assert shapes.__iter__.call_count == 2
+
+
+def test_shape_edit_only_forgets_the_edited_slide(setup_ppt_automation, mock_presentation):
+    """Test that a failed edit keeps cached listings and a successful one only drops its own slide."""
+    pres_id = setup_ppt_automation
+    first = list_all_shapes_in_slide(pres_id, 1, refresh=False)
+
+    set_shape_position("missing", 1, 1, left=10)
+    set_shape_position(pres_id, 2, 1, left=10)
+
+    assert list_all_shapes_in_slide(pres_id, 1, refresh=False) is first
+
+
+def test_list_all_shapes_in_slide_paging(setup_ppt_automation):
+    """Test fetching a slide's shapes one page at a time."""
+    pres_id = setup_ppt_automation
+
+    first = list_all_shapes_in_slide(pres_id, 1, refresh=False, limit=1)
+    second = list_all_shapes_in_slide(pres_id, 1, refresh=False, offset=first["next_offset"], limit=1)
+
+    assert [shape["id"] for shape in first["shapes"]] == ["1"]
+    assert [shape["id"] for shape in second["shapes"]] == ["2"]
+    assert second["shape_count"] == 2
+    assert "next_offset" not in second
+
+
 def test_list_all_shapes_in_slide_invalid_presentation():
     """Test list_all_shapes_in_slide with invalid presentation ID."""
     result = list_all_shapes_in_slide("invalid-id", 1)
@@ -245,6 +351,377 @@ def test_save_copy_invalid_presentation():
     assert "Presentation ID not found" in result["error"]
 
 
+def test_set_shape_position_uses_macro(setup_ppt_automation):
+    """Test that set_shape_position applies only the given values through one macro call."""
+    pres_id = setup_ppt_automation
+
+    with patch.object(ppt_automation, "run_macro", return_value=" 10\x1f 20\x1f 300\x1f 40") as run_macro:
+        result = set_shape_position(pres_id, 1, 1, left=10, height=40)
+
+    assert result["success"] is True
+    assert result["new_position"] == {"left": 10.0, "top": 20.0, "width": 300.0, "height": 40.0}
+    assert run_macro.call_args.args[-1] == 1 | 8
+
+
+def test_copy_shape_same_slide_uses_duplicate(setup_ppt_automation, mock_presentation):
+    """Test that copying within one slide duplicates the shape without the clipboard."""
+    pres_id = setup_ppt_automation
+    shape = mock_presentation.Slides.Item(1).Shapes.Item(1)
+    shape.Duplicate.return_value.Item.return_value.ZOrderPosition = 3
+
+    result = copy_shape(pres_id, 1, 1, 1, left=50)
+
+    assert result["success"] is True
+    assert result["new_shape_id"] == "3"
+    shape.Duplicate.assert_called_once()
+    shape.Copy.assert_not_called()
+
+
+def test_copy_shape_invalid_target_slide(setup_ppt_automation, mock_presentation):
+    """Test that an out-of-range target slide ID is rejected by the Slides.Item lookup."""
+    pres_id = setup_ppt_automation
+
+    result = copy_shape(pres_id, 1, 1, 7)
+
+    assert "Invalid target slide ID" in result["error"]
+
+
+def test_set_shape_positions_reports_each_update(setup_ppt_automation, mock_presentation):
+    """Test that a bulk position update reports each update and rejects bad IDs individually."""
+    pres_id = setup_ppt_automation
+    mock_presentation.Slides.Item.reset_mock()
+
+    with patch.object(ppt_automation, "run_macro", return_value=" 10\x1f 20\x1f 30\x1f 40") as run_macro, \
+            patch("main.collect_com_garbage") as collect:
+        result = set_shape_positions(pres_id, [
+            {"slide_id": 1, "shape_id": 1, "left": 10},
+            {"slide_id": "2", "shape_id": "1", "top": 20},
+            {"slide_id": 9, "shape_id": 1, "left": 0},
+            {"slide_id": "x", "shape_id": 1},
+            {"slide_id": "1", "shape_id": 2, "width": 30},
+        ])
+
+    assert result["success"] is False
+    assert result["updated"] == 3
+    assert result["results"][0]["new_position"]["left"] == 10.0
+    assert "Invalid slide ID" in result["results"][2]["error"]
+    assert "Invalid ID format" in result["results"][3]["error"]
+    assert result["results"][4]["success"] is True
+    assert run_macro.call_count == 3
+    # Each slide is looked up once, and garbage is collected once per call
+    assert [call.args for call in mock_presentation.Slides.Item.call_args_list] == [(1,), (2,), (9,)]
+    collect.assert_called_once()
+
+
+def test_update_texts_success(setup_ppt_automation):
+    """Test updating several shapes in one call."""
+    pres_id = setup_ppt_automation
+
+    result = update_texts(pres_id, [
+        {"slide_id": 1, "shape_id": 1, "text": "First"},
+        {"slide_id": "2", "shape_id": "2", "text": "Second"},
+    ])
+
+    assert result["success"] is True
+    assert result["updated"] == 2
+    assert len(result["results"]) == 2
+
+
+def test_update_texts_reports_each_edit(setup_ppt_automation):
+    """Test that invalid edits are reported per edit without aborting the batch."""
+    pres_id = setup_ppt_automation
+
+    result = update_texts(pres_id, [
+        {"slide_id": 1, "shape_id": 1, "text": "Valid"},
+        {"slide_id": 10, "shape_id": 1, "text": "Bad slide"},
+        {"slide_id": 1, "shape_id": 5, "text": "Bad shape"},
+        {"slide_id": "abc", "shape_id": 1, "text": "Bad format"},
+    ])
+
+    assert result["success"] is False
+    assert result["updated"] == 1
+    assert result["results"][0]["success"] is True
+    assert "Invalid slide ID" in result["results"][1]["error"]
+    assert "Invalid shape ID" in result["results"][2]["error"]
+    assert "Invalid ID format" in result["results"][3]["error"]
+
+
+def test_update_texts_invalid_presentation():
+    """Test update_texts with invalid presentation ID."""
+    result = update_texts("invalid-id", [{"slide_id": 1, "shape_id": 1, "text": "x"}])
+
+    assert "error" in result
+    assert "Presentation ID not found" in result["error"]
+
+
+def test_update_text_single_edit(setup_ppt_automation):
+    """Test that update_text returns the single edit's status."""
+    pres_id = setup_ppt_automation
+
+    result = update_text(pres_id, "1", "1", "New text")
+
+    assert result["success"] is True
+
+
+def test_slide_size_reads_ui_changes(mock_presentation):
+    """Test that a slide size changed in PowerPoint is picked up by the next export."""
+    mock_presentation.PageSetup.SlideWidth = 960.0
+    mock_presentation.PageSetup.SlideHeight = 540.0
+    assert slide_size(mock_presentation) == (960.0, 540.0, 960.0 / 540.0)
+
+    mock_presentation.PageSetup.SlideWidth = 720.0
+    assert slide_size(mock_presentation)[0] == 720.0
+
+
+def test_export_slide_as_image_async(setup_ppt_automation, mock_presentation):
+    """Test that an async export is queued on the COM thread and reported by get_export_status."""
+    pres_id = setup_ppt_automation
+    mock_presentation.PageSetup.SlideWidth = 960.0
+    mock_presentation.PageSetup.SlideHeight = 540.0
+
+    result = export_slide_as_image(pres_id, 1, async_export=True)
+
+    assert result["success"] is True
+    assert result["pending"] is True
+    status = get_export_status(result["path"])
+    assert status["success"] is True
+    mock_presentation.Slides.Item(1).Export.assert_called_once_with(result["path"], "JPG", 1920, 1080)
+    assert "error" in get_export_status(result["path"])
+
+
+def test_track_export_never_drops_unfinished_exports():
+    """Test that only finished exports are dropped when the pending store is full."""
+    from concurrent.futures import Future
+    import main
+
+    done, running, queued = Future(), Future(), Future()
+    done.set_result(None)
+    with patch.object(main, "PENDING_EXPORTS_SIZE", 2), patch.dict(pending_exports, clear=True):
+        track_export("a.jpg", running)
+        track_export("b.jpg", done)
+        track_export("c.jpg", queued)
+        track_export("d.jpg", Future())
+
+        assert list(pending_exports) == ["a.jpg", "c.jpg", "d.jpg"]
+
+
+def test_export_slides_as_images_batch(setup_ppt_automation, mock_presentation):
+    """Test that a batch export reports each slide and rejects invalid IDs individually."""
+    pres_id = setup_ppt_automation
+    mock_presentation.PageSetup.SlideWidth = 960.0
+    mock_presentation.PageSetup.SlideHeight = 540.0
+
+    result = export_slides_as_images(pres_id, [1, "3", 7, "x"], width=960, image_format="jpeg")
+
+    assert result["success"] is False
+    assert result["exported"] == 2
+    assert result["image_format"] == "JPEG"
+    assert result["dimensions"] == {"width": 960, "height": 540}
+    assert [entry["slide_id"] for entry in result["exports"]] == [1, 3, 7, "x"]
+    assert "error" in result["exports"][2]
+    assert "error" in result["exports"][3]
+
+
+def test_export_slide_as_image_reuses_unchanged_export(setup_ppt_automation, mock_presentation):
+    """Test that with refresh=False a repeated export of an unchanged slide returns the earlier file."""
+    pres_id = setup_ppt_automation
+    mock_presentation.PageSetup.SlideWidth = 960.0
+    mock_presentation.PageSetup.SlideHeight = 540.0
+    slide = mock_presentation.Slides.Item(2)
+
+    with patch("main.os.path.exists", return_value=True):
+        first = export_slide_as_image(pres_id, 2, refresh=False)
+        second = export_slide_as_image(pres_id, 2, refresh=False)
+        assert second["cached"] is True
+        assert second["path"] == first["path"]
+        assert slide.Export.call_count == 1
+
+        # The default always renders the slide again
+        assert export_slide_as_image(pres_id, 2)["cached"] is False
+        assert slide.Export.call_count == 2
+
+        set_shape_position(pres_id, 2, 1, left=10)
+        assert export_slide_as_image(pres_id, 2, refresh=False)["cached"] is False
+        assert slide.Export.call_count == 3
+
+        # A shape moved in the PowerPoint UI changes the slide's fingerprint
+        slide.Shapes.Item(1).Left = 50
+        assert export_slide_as_image(pres_id, 2, refresh=False)["cached"] is False
+        assert slide.Export.call_count == 4
+
+
+def test_export_slide_as_image_inline_bytes(setup_ppt_automation, mock_presentation, tmp_path):
+    """Test that inline_bytes returns the image base64-encoded and removes the file."""
+    pres_id = setup_ppt_automation
+    mock_presentation.PageSetup.SlideWidth = 960.0
+    mock_presentation.PageSetup.SlideHeight = 540.0
+    mock_presentation.Slides.Item(1).Export.side_effect = lambda path, *args: Path(path).write_bytes(b"img")
+
+    with patch.dict(os.environ, {"TMPDIR_RAM": str(tmp_path)}):
+        result = export_slide_as_image(pres_id, 1, inline_bytes=True)
+
+    assert result["success"] is True
+    assert result["image_b64"] == "aW1n"
+    assert result["path"] is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_export_slide_as_image_inline_bytes_keeps_existing_files(setup_ppt_automation, mock_presentation, tmp_path):
+    """Test that inline_bytes never deletes a cached export or the caller's overwrite_path file."""
+    pres_id = setup_ppt_automation
+    mock_presentation.PageSetup.SlideWidth = 960.0
+    mock_presentation.PageSetup.SlideHeight = 540.0
+    mock_presentation.Slides.Item(1).Export.side_effect = lambda path, *args: Path(path).write_bytes(b"img")
+    target = tmp_path / "slide.jpg"
+
+    with patch.dict(os.environ, {"TMPDIR_RAM": str(tmp_path)}):
+        first = export_slide_as_image(pres_id, 1, refresh=False)
+        inline = export_slide_as_image(pres_id, 1, inline_bytes=True, refresh=False)
+        assert inline["cached"] is True
+        assert inline["path"] == first["path"]
+        assert os.path.exists(first["path"])
+
+        export_slide_as_image(pres_id, 1, inline_bytes=True, overwrite_path=str(target))
+        assert target.exists()
+
+
+def test_export_slide_as_image_overwrite_path(setup_ppt_automation, mock_presentation, tmp_path):
+    """Test that overwrite_path exports to the given file instead of a new temp file."""
+    pres_id = setup_ppt_automation
+    mock_presentation.PageSetup.SlideWidth = 960.0
+    mock_presentation.PageSetup.SlideHeight = 540.0
+    target = str(tmp_path / "slide.jpg")
+
+    result = export_slide_as_image(pres_id, 3, overwrite_path=target)
+
+    assert result["path"] == target
+    mock_presentation.Slides.Item(3).Export.assert_called_once_with(target, "JPG", 1920, 1080)
+
+
+def test_export_slide_as_image_overwrite_path_not_reused(setup_ppt_automation, mock_presentation, tmp_path):
+    """Test that a file written through overwrite_path is never served as another export's cache hit."""
+    pres_id = setup_ppt_automation
+    mock_presentation.PageSetup.SlideWidth = 960.0
+    mock_presentation.PageSetup.SlideHeight = 540.0
+    target = str(tmp_path / "slide.jpg")
+
+    with patch("main.os.path.exists", return_value=True):
+        export_slide_as_image(pres_id, 1, overwrite_path=target, refresh=False)
+        export_slide_as_image(pres_id, 2, overwrite_path=target, refresh=False)
+        result = export_slide_as_image(pres_id, 1, refresh=False)
+
+    assert result["cached"] is False
+    assert result["path"] != target
+
+
+def test_export_slide_as_image_rejects_format_before_com(setup_ppt_automation, mock_presentation):
+    """Test that an unsupported image format is rejected without touching the presentation."""
+    pres_id = setup_ppt_automation
+    mock_presentation.Slides.Item.reset_mock()
+
+    result = export_slide_as_image(pres_id, 99, image_format="GIF")
+
+    assert "Invalid image format" in result["error"]
+    mock_presentation.Slides.Item.assert_not_called()
+
+
+def test_export_dimensions_rounds_width_to_16():
+    """Test that only a width derived from the height is rounded up to a multiple of 16."""
+    assert export_dimensions(16 / 9, 1000) == (1000, 562)
+    assert export_dimensions(16 / 9, height=500) == (896, 500)
+    assert export_dimensions(16 / 9, height=500, strict_size=True) == (888, 500)
+    assert export_dimensions(16 / 9, 1000, 500) == (1000, 500)
+
+
+def test_register_reuses_id_for_same_presentation():
+    """Test that registering a presentation twice returns its existing ID until it is unregistered."""
+    pres = MagicMock()
+
+    pres_id = ppt_automation.register(pres)
+    assert ppt_automation.register(pres) == pres_id
+    assert ppt_automation.register(MagicMock()) != pres_id
+
+    ppt_automation.unregister(pres_id)
+    assert pres_id not in ppt_automation.presentations
+    assert ppt_automation.register(pres) != pres_id
+
+
+def test_register_reuses_id_for_another_wrapper():
+    """Test that a second wrapper of a registered presentation gets the same ID."""
+    class Wrapper:
+        def __init__(self, token):
+            self._oleobj_ = object()
+            self.token = token
+
+        def __eq__(self, other):
+            return isinstance(other, Wrapper) and other.token == self.token
+
+        __hash__ = object.__hash__
+
+    first, second = Wrapper("deck"), Wrapper("deck")
+    assert first is not second and first._oleobj_ is not second._oleobj_
+
+    pres_id = ppt_automation.register(first)
+    assert ppt_automation.register(second) == pres_id
+    assert ppt_automation.register(Wrapper("other")) != pres_id
+    assert len(ppt_automation.presentations) == 2
+
+
+def test_get_slides_paging(setup_ppt_automation, mock_presentation):
+    """Test that get_slides reads only the slides on the requested page."""
+    pres_id = setup_ppt_automation
+
+    page = get_slides(pres_id, offset=1, limit=1)
+
+    assert len(page) == 1
+    mock_presentation.Slides.Item.assert_called_once_with(2)
+    assert get_slides(pres_id, offset=3) == []
+
+
+def test_com_apartment_runs_calls_on_one_thread():
+    """Test that queued calls share a single worker thread and propagate exceptions."""
+    import threading
+
+    first = com_apartment.submit(threading.get_ident).result(timeout=5)
+    second = com_apartment.submit(threading.get_ident).result(timeout=5)
+
+    assert first == second
+    assert first != threading.get_ident()
+
+    with pytest.raises(ValueError):
+        com_apartment.submit(int, "abc").result(timeout=5)
+
+
+def test_macro_host_closed_at_exit():
+    """Test that the hidden macro host is closed on the COM thread at shutdown."""
+    host = Mock()
+    ppt_automation._macro_host = host
+    ppt_automation._macro_host_name = "Presentation9"
+    ppt_automation._macros_available = True
+
+    close_macro_host_at_exit()
+
+    host.Close.assert_called_once()
+    assert ppt_automation._macro_host is None
+    assert ppt_automation._macros_available is None
+
+
+def test_run_macro_disabled_after_failure():
+    """Test that a failing Application.Run switches the helper macros off."""
+    import pywintypes
+
+    app = Mock()
+    app.Run.side_effect = pywintypes.com_error(-2147352567, "Exception occurred.", None, None)
+
+    with patch.object(ppt_automation, "ppt_app", app), \
+            patch.object(ppt_automation, "_macros_available", True), \
+            patch.object(ppt_automation, "_macro_host_name", "Presentation9"):
+        assert ppt_automation.run_macro("DumpShapes", 1, 1) is None
+        assert ppt_automation.run_macro("DumpShapes", 1, 1) is None
+
+    assert app.Run.call_count == 1
+
+
 class TestEdgeCases:
     """Test edge cases and error conditions."""
 